@@ -12,18 +12,34 @@ import logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Cache for the configuration loaded from the process environment
+_cached_config: Optional[Dict[str, Any]] = None
 
-def get_searxng_config(env_vars: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+
+def get_searxng_config(
+    env_vars: Optional[Dict[str, Any]] = None,
+    force_reload: bool = False
+) -> Dict[str, Any]:
     """
     Get SearxNG configuration from environment variables.
 
+    The configuration read from the process environment is cached, since
+    it is requested for every search.
+
     Args:
         env_vars: A dictionary of environment variables (for testing).
+            Configurations built from it are not cached.
+        force_reload: If True, reload the configuration even if cached.
 
     Returns:
         A dictionary containing SearxNG configuration options.
     """
+    global _cached_config
+
     if env_vars is None:
+        # If we have a cached config and don't need to force reload, use it
+        if _cached_config is not None and not force_reload:
+            return _cached_config
         env_vars = os.environ
         
     logger.info("Loading SearxNG configuration from environment variables")
@@ -37,6 +53,11 @@ def get_searxng_config(env_vars: Optional[Dict[str, Any]] = None) -> Dict[str, A
     # Get safe search level with validation
     safe_search = _parse_safe_search(env_vars.get('SEARXNG_SAFE_SEARCH', '1'))
     
+    # Get the delay before hedging slow image searches with Serper
+    image_hedge_delay = _parse_hedge_delay(
+        env_vars.get('SEARXNG_IMAGE_HEDGE_DELAY', '0')
+    )
+    
     # Create the config dictionary
     config: Dict[str, Any] = {
         'base_url': base_url,
@@ -44,14 +65,19 @@ def get_searxng_config(env_vars: Optional[Dict[str, Any]] = None) -> Dict[str, A
         'categories': env_vars.get('SEARXNG_CATEGORIES', 'general'),
         'language': env_vars.get('SEARXNG_LANGUAGE', 'en'),
         'safe_search': safe_search,
+        'image_hedge_delay': image_hedge_delay,
     }
     
     logger.info(
         f"SearxNG configuration loaded: base_url={config['base_url']}, "
         f"timeout={config['timeout']}, categories={config['categories']}, "
-        f"language={config['language']}, safe_search={config['safe_search']}"
+        f"language={config['language']}, safe_search={config['safe_search']}, "
+        f"image_hedge_delay={config['image_hedge_delay']}"
     )
 
+    if env_vars is os.environ:
+        _cached_config = config
+
     return config
 
 
@@ -127,4 +153,32 @@ def _parse_safe_search(safe_search_str: str) -> int:
             f"Invalid SearxNG safe_search value: '{safe_search_str}'. Using "
             f"default of 1. Error: {str(e)}"
         )
-        return 1
\ No newline at end of file
+        return 1
+
+
+def _parse_hedge_delay(delay_str: str) -> float:
+    """
+    Parse the image search hedge delay from string.
+    
+    Args:
+        delay_str: Delay in seconds as string, 0 to disable hedging
+        
+    Returns:
+        Parsed delay in seconds
+    """
+    delay_str = delay_str.split('#')[0].strip()
+    try:
+        delay = float(delay_str)
+        if delay < 0:
+            logger.warning(
+                f"Invalid SearxNG image hedge delay: {delay}. Disabling "
+                f"hedged image searches"
+            )
+            return 0.0
+        return delay
+    except (ValueError, TypeError) as e:
+        logger.warning(
+            f"Invalid SearxNG image hedge delay value: '{delay_str}'. "
+            f"Disabling hedged image searches. Error: {str(e)}"
+        )
+        return 0.0
\ No newline at end of file
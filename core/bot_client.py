@@ -58,7 +58,14 @@ class BotClient(discord.Client):
         """
         super().__init__(*args, **kwargs)
         logger.info("Initializing BotClient")
-        self.httpx_client = httpx.AsyncClient(http2=True)
+        self.httpx_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=128,
+                max_keepalive_connections=64,
+                keepalive_expiry=30
+            )
+        )
         self.msg_nodes: Dict[int, MsgNode] = {}
         self.command_manager = None
         self.api_key_manager: Optional[APIKeyManager] = None
@@ -327,7 +334,7 @@ class BotClient(discord.Client):
         
         # Build conversation context
         logger.info(f"Building conversation context for message {new_msg.id}")
-        messages, user_warnings = await build_conversation_context(
+        messages, user_warnings, last_user_idx = await build_conversation_context(
             new_msg,
             self.user,
             self.msg_nodes,
@@ -348,7 +355,8 @@ class BotClient(discord.Client):
                 progress_message,
                 messages,
                 cfg,
-                allowed_mentions
+                allowed_mentions,
+                last_user_idx
             )
         else:
             # Process regular message
@@ -360,7 +368,8 @@ class BotClient(discord.Client):
                 max_message_length,
                 api_key,
                 user_warnings,
-                allowed_mentions
+                allowed_mentions,
+                last_user_idx
             )
         
         # Manage message node cache size
@@ -373,7 +382,8 @@ class BotClient(discord.Client):
         progress_message: Message,
         messages: List[Dict[str, Any]],
         cfg: Dict[str, Any],
-        allowed_mentions: AllowedMentions
+        allowed_mentions: AllowedMentions,
+        last_user_idx: Optional[int] = None
     ) -> None:
         """
         Handle special commands like lens and sauce.
@@ -385,6 +395,7 @@ class BotClient(discord.Client):
             messages: List of message objects
             cfg: Configuration dictionary
             allowed_mentions: Allowed mentions settings
+            last_user_idx: Index of the latest user message in messages
         """
         logger.info(f"Handling {cmd_type} command for message {new_msg.id}")
         error = await handle_lens_sauce_commands(
@@ -394,7 +405,8 @@ class BotClient(discord.Client):
             messages,
             self.api_key_manager,
             self.httpx_client,
-            cfg
+            cfg,
+            last_user_idx
         )
         
         if error:
@@ -437,7 +449,8 @@ class BotClient(discord.Client):
         max_message_length: int,
         api_key: str,
         user_warnings: Set[str],
-        allowed_mentions: AllowedMentions
+        allowed_mentions: AllowedMentions,
+        last_user_idx: Optional[int] = None
     ) -> None:
         """
         Handle regular message (not a special command).
@@ -451,6 +464,7 @@ class BotClient(discord.Client):
             api_key: API key to use
             user_warnings: Set of user warnings
             allowed_mentions: Allowed mentions settings
+            last_user_idx: Index of the latest user message in messages
         """
         logger.info(f"Handling regular message for message {new_msg.id}")
         await handle_regular_message(
@@ -459,7 +473,8 @@ class BotClient(discord.Client):
             messages,
             self.api_key_manager,
             self.httpx_client,
-            cfg
+            cfg,
+            last_user_idx
         )
         
         # Prepare "Searched for" text if applicable
@@ -602,26 +617,26 @@ class BotClient(discord.Client):
         Returns:
             List of response messages
         """
-        # Collect content from the stream
-        response_contents = []
-        prev_chunk = None
-        
-        async for curr_chunk in stream:
-            prev_content = (
-                prev_chunk.choices[0].delta.content
-                if (prev_chunk is not None and 
-                    prev_chunk.choices[0].delta.content)
-                else ""
-            )
-            curr_content = curr_chunk.choices[0].delta.content or ""
-            
-            if response_contents or prev_content:
-                if (response_contents == [] or 
-                        len(response_contents[-1] + prev_content) > max_message_length):
-                    response_contents.append("")
-                response_contents[-1] += prev_content
+        # Collect content from the stream, split into messages of at most
+        # max_message_length; each message's chunks are joined once
+        response_contents: List[str] = []
+        message_parts: List[str] = []
+        message_len = 0
+        
+        async for chunk in stream:
+            content = chunk.choices[0].delta.content or ""
+            if not content:
+                continue
             
-            prev_chunk = curr_chunk
+            if message_parts and message_len + len(content) > max_message_length:
+                response_contents.append("".join(message_parts))
+                message_parts = []
+                message_len = 0
+            message_parts.append(content)
+            message_len += len(content)
+        
+        if message_parts:
+            response_contents.append("".join(message_parts))
         
         # Handle the response using the handler
         serper_queries = getattr(
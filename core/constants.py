@@ -49,6 +49,10 @@ logger.debug("Embed colors defined")
 STREAMING_INDICATOR: str = " ⚪"
 logger.debug(f"Streaming indicator defined: {STREAMING_INDICATOR}")
 
+# Maximum length of a Discord embed description
+EMBED_DESCRIPTION_LIMIT: int = 4096
+logger.debug(f"Embed description limit defined: {EMBED_DESCRIPTION_LIMIT} characters")
+
 # Delay between edits to prevent rate limiting
 EDIT_DELAY_SECONDS: int = 1
 logger.debug(f"Edit delay defined: {EDIT_DELAY_SECONDS} seconds")
@@ -101,7 +101,9 @@ class OutputView(discord.ui.View):
         Initialize the view with content and optional image data.
         
         Args:
-            contents: Text content to display
+            contents: Text content to display. A list is kept by reference
+                rather than copied, so a streaming response can keep
+                appending to it and a single view stays current.
             query: Original query that produced this output
             serper_queries: Search queries used (if any)
             image_files: Dictionary mapping queries to image files
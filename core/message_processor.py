@@ -9,18 +9,28 @@ This module handles processing of Discord messages, including:
 """
 
 import asyncio
+import functools
 import html
 import logging
 import re
-from base64 import b64encode
-from datetime import datetime as dt
-from typing import Dict, Any, List, Optional, Tuple, Literal
+from binascii import b2a_base64
+from collections import OrderedDict, deque
+from datetime import date, datetime as dt
+from typing import Deque, Dict, Any, FrozenSet, List, Optional, Tuple, Literal
 
 import discord
 import httpx
 from discord import Message, File, ClientUser
 
+try:
+    # SIMD-accelerated base64 when available
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    def _b64encode(data: bytes) -> bytes:
+        return b2a_base64(data, newline=False)
+
 from config.api_key_manager import APIKeyManager
+from core.constants import PROVIDERS_SUPPORTING_USERNAMES, VISION_MODEL_TAGS
 from core.message_node import MsgNode
 from images.google_lens_handler import (
     get_google_lens_results,
@@ -29,12 +39,155 @@ from images.google_lens_handler import (
 from images.saucenao_handler import handle_saucenao_query
 from llm.query_splitter_handler import split_query
 from llm.rephraser_handler import rephrase_query
-from search.search_handler import handle_search_queries
-from search.url_handler import extract_urls_from_text, fetch_urls_content
+from search.search_handler import handle_search_queries, search_query
+from search.url_handler import (
+    classify_url,
+    extract_urls_from_text,
+    fetch_urls_content
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Mime types the Google provider accepts as file attachments; values that
+# contain a '/' are the mime type to send instead of the original
+GOOGLE_SUPPORTED_MIME_TYPES: Dict[str, str] = {
+    'application/pdf': 'pdf',
+    'application/x-javascript': 'text/javascript',
+    'text/javascript': 'javascript',
+    'application/x-python': 'text/x-python',
+    'text/x-python': 'python',
+    'text/plain': 'txt',
+    'text/html': 'html',
+    'text/css': 'css',
+    'text/md': 'markdown',
+    'text/csv': 'csv',
+    'text/xml': 'xml',
+    'text/rtf': 'rtf',
+    'audio/wav': 'audio',
+    'audio/mp3': 'audio',
+    'audio/aiff': 'audio',
+    'audio/aac': 'audio',
+    'audio/ogg': 'audio',
+    'audio/flac': 'audio'
+}
+_GOOGLE_MIME_SET: FrozenSet[str] = frozenset(GOOGLE_SUPPORTED_MIME_TYPES)
+
+# Largest attachment the Google provider accepts inline
+MAX_GOOGLE_FILE_SIZE_BYTES: int = 20 * 1024 * 1024  # 20 MB limit
+
+# Display names for URL kinds returned by classify_url
+URL_KIND_LABELS: Dict[str, str] = {
+    'web': 'Web',
+    'youtube': 'YouTube',
+    'reddit': 'Reddit',
+}
+
+# Templates for the augmented user message sent in place of the original
+# query; every user-supplied field goes through _escape_prompt_text
+COMMAND_PROMPT_TEMPLATE: str = "User Query: {query}\n\n{results_tag}:\n{results}"
+URL_PROMPT_HEADER_TEMPLATE: str = (
+    "answer the user query based on the {kind} content. don't generate images.\n\n"
+    "user query:\n{query}\n\n"
+    "{kind} content:\n"
+)
+URL_SOURCE_TEMPLATE: str = "Source {idx} ({label}):\nURL: {url}\n{content}\n\n"
+SEARCH_PROMPT_TEMPLATE: str = (
+    "answer the user query based on the aggregated search results. don't generate images.\n\n"
+    "user query:\n{query}\n\n"
+    "{results}"
+)
+
+# Download chunk size for base64 streaming; a multiple of 3 so that no
+# padding is emitted between chunks
+BASE64_STREAM_CHUNK_SIZE: int = 3 * 64 * 1024
+
+# Attachments at least this large are base64-encoded in a worker thread so
+# the event loop keeps serving the Discord gateway while encoding
+BASE64_OFFLOAD_THRESHOLD_BYTES: int = 256 * 1024
+
+# Cap on simultaneous attachment downloads from the Discord CDN
+MAX_CONCURRENT_ATTACHMENT_DOWNLOADS: int = 8
+_attachment_download_semaphore = asyncio.Semaphore(
+    MAX_CONCURRENT_ATTACHMENT_DOWNLOADS
+)
+
+# Bounds for the in-memory cache of downloaded attachments
+ATTACHMENT_CACHE_MAX_ENTRIES: int = 256
+ATTACHMENT_CACHE_MAX_CHARS: int = 64 * 1024 * 1024
+
+
+class _AttachmentCache:
+    """
+    LRU cache of downloaded attachment content, bounded by entry count and
+    total characters stored.
+    """
+    
+    def __init__(self, max_entries: int, max_chars: int) -> None:
+        """
+        Initialize an empty cache.
+        
+        Args:
+            max_entries: Maximum number of cached attachments
+            max_chars: Maximum total characters across cached attachments
+        """
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._chars = 0
+    
+    def get(self, key: Tuple[str, int, int]) -> Optional[str]:
+        """
+        Look up a cached attachment and mark it as recently used.
+        
+        Args:
+            key: Tuple of (kind, attachment ID, attachment size)
+            
+        Returns:
+            The cached content or None
+        """
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key: Tuple[str, int, int], value: str) -> None:
+        """
+        Store attachment content, evicting least recently used entries.
+        
+        Args:
+            key: Tuple of (kind, attachment ID, attachment size)
+            value: Attachment content to cache
+        """
+        if len(value) > self.max_chars:
+            return
+        if key in self._entries:
+            self._chars -= len(self._entries.pop(key))
+        self._entries[key] = value
+        self._chars += len(value)
+        while (len(self._entries) > self.max_entries
+               or self._chars > self.max_chars):
+            _, evicted = self._entries.popitem(last=False)
+            self._chars -= len(evicted)
+
+
+_attachment_cache = _AttachmentCache(
+    ATTACHMENT_CACHE_MAX_ENTRIES, ATTACHMENT_CACHE_MAX_CHARS
+)
+
+
+def _image_url_dict(url: str) -> Dict[str, Any]:
+    """
+    Build an LLM ``image_url`` content part for the given URL.
+    
+    Args:
+        url: Image (or file) URL, usually a base64 data URL
+        
+    Returns:
+        Content part dictionary in the format expected by LiteLLM
+    """
+    return {"type": "image_url", "image_url": {"url": url}}
+
 
 async def process_message_attachments(
     message: Message,
@@ -61,86 +214,30 @@ async def process_message_attachments(
         - List of image data
         - Flag indicating if there were unsupported attachments
     """
-    # Define max file size for Google provider
-    MAX_GOOGLE_FILE_SIZE_BYTES = 20 * 1024 * 1024  # 20 MB limit
-    
-    # Define mime types for Google provider
-    google_supported_mime_types = {
-        'application/pdf': 'pdf',
-        'application/x-javascript': 'text/javascript',
-        'text/javascript': 'javascript',
-        'application/x-python': 'text/x-python',
-        'text/x-python': 'python',
-        'text/plain': 'txt',
-        'text/html': 'html',
-        'text/css': 'css',
-        'text/md': 'markdown',
-        'text/csv': 'csv',
-        'text/xml': 'xml',
-        'text/rtf': 'rtf',
-        'audio/wav': 'audio',
-        'audio/mp3': 'audio',
-        'audio/aiff': 'audio',
-        'audio/aac': 'audio',
-        'audio/ogg': 'audio',
-        'audio/flac': 'audio'
-    }
-    
     provider = provider or ""  # Default to empty string if None
     is_google_provider = provider.lower() == 'google'
     
-    # Collect attachments by type
+    # Collect attachments by their major content type in a single pass
     good_attachments: Dict[str, List[discord.Attachment]] = {
-        type: [
-            att
-            for att in message.attachments
-            if att.content_type and type in att.content_type
-        ]
-        for type in allowed_file_types
+        file_type: [] for file_type in allowed_file_types
     }
+    for att in message.attachments:
+        major_type = (att.content_type or "").split("/", 1)[0].strip().lower()
+        if major_type in good_attachments:
+            good_attachments[major_type].append(att)
     
-    # Build text content
-    text_parts = []
-    if message.content:
-        text_parts.append(message.content)
-    
-    for embed in message.embeds:
-        if embed.description:
-            text_parts.append(embed.description)
-    
-    # Process text file attachments
-    for att in good_attachments.get("text", []):
-        try:
-            response = await httpx_client.get(att.url)
-            text_content = response.text
-            text_parts.append(
-                f'<text_file name="{html.escape(att.filename)}">\n'
-                f'{html.escape(text_content)}\n'
-                f'</text_file>'
-            )
-        except Exception as e:
-            logger.error(
-                f"Error fetching text from attachment {att.filename}: {e}", 
-                exc_info=True
-            )
-    
-    text_content = "\n".join(text_parts)
-    
-    # Remove bot mention if it starts the message
-    if text_content.startswith(bot_user.mention):
-        text_content = text_content.replace(bot_user.mention, "", 1).lstrip()
-        
-    images: List[Dict[str, Any]] = []
     has_bad_attachments: bool = False
     
-    # Process attachments based on provider
+    # Decide which attachments to send as data URLs, with their mime types,
+    # before downloading anything
+    binary_attachments: List[Tuple[discord.Attachment, str]] = []
     if is_google_provider:
-        logger.info(f"Processing attachments for Google provider (Gemini)")
+        logger.info("Processing attachments for Google provider (Gemini)")
         
         for att in message.attachments:
             logger.debug(
-                f"Processing attachment: {att.filename}, "
-                f"content_type: {att.content_type}, size: {att.size} bytes"
+                "Processing attachment: %s, content_type: %s, size: %d bytes",
+                att.filename, att.content_type, att.size
             )
             
             if att.size > MAX_GOOGLE_FILE_SIZE_BYTES:
@@ -152,66 +249,25 @@ async def process_message_attachments(
                 continue
                 
             if att.content_type:
+                # Compare the bare mime type, without parameters like charset
+                mime_type = (
+                    att.content_type.split(";", 1)[0].strip().lower()
+                )
+                
                 # Handle image attachment
-                if "image" in att.content_type:
-                    logger.debug(f"Adding image attachment: {att.filename}")
-                    try:
-                        response = await httpx_client.get(att.url)
-                        image_data = response.content
-                        images.append(
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": (
-                                        f"data:{att.content_type};base64,"
-                                        f"{b64encode(image_data).decode('utf-8')}"
-                                    )
-                                },
-                            }
-                        )
-                    except Exception as e:
-                        logger.error(
-                            f"Error downloading image {att.filename}: {e}", 
-                            exc_info=True
-                        )
-                        has_bad_attachments = True
+                if mime_type.startswith("image/"):
+                    logger.debug("Adding image attachment: %s", att.filename)
+                    binary_attachments.append((att, mime_type))
                 
                 # Handle supported file types for Google Gemini
-                elif any(
-                    mime_type in att.content_type 
-                    for mime_type in google_supported_mime_types
-                ):
+                elif mime_type in _GOOGLE_MIME_SET:
                     logger.debug(
-                        f"Adding file attachment as data URL: {att.filename}"
+                        "Adding file attachment as data URL: %s", att.filename
                     )
-                    try:
-                        response = await httpx_client.get(att.url)
-                        content = response.content
-                        
-                        # Use original mime type or normalize it if needed
-                        mime_type = att.content_type
-                        if (mime_type in google_supported_mime_types and
-                                isinstance(google_supported_mime_types[mime_type], str) and
-                                '/' in google_supported_mime_types[mime_type]):
-                            mime_type = google_supported_mime_types[mime_type]
-                        
-                        images.append(
-                            {
-                                "type": "image_url",  # LiteLLM uses image_url for all files
-                                "image_url": {
-                                    "url": (
-                                        f"data:{mime_type};base64,"
-                                        f"{b64encode(content).decode('utf-8')}"
-                                    )
-                                },
-                            }
-                        )
-                    except Exception as e:
-                        logger.error(
-                            f"Error downloading file {att.filename}: {e}", 
-                            exc_info=True
-                        )
-                        has_bad_attachments = True
+                    # Use original mime type or normalize it if needed
+                    if '/' in GOOGLE_SUPPORTED_MIME_TYPES[mime_type]:
+                        mime_type = GOOGLE_SUPPORTED_MIME_TYPES[mime_type]
+                    binary_attachments.append((att, mime_type))
                 else:
                     logger.warning(
                         f"Unsupported file type for Google API: {att.filename} "
@@ -220,28 +276,10 @@ async def process_message_attachments(
                     has_bad_attachments = True
     else:
         # Original behavior for other providers - only handle images
-        logger.debug(f"Processing images for non-Google provider: {provider}")
-        for att in good_attachments.get("image", []):
-            try:
-                response = await httpx_client.get(att.url)
-                image_data = response.content
-                images.append(
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": (
-                                f"data:{att.content_type};base64,"
-                                f"{b64encode(image_data).decode('utf-8')}"
-                            )
-                        },
-                    }
-                )
-            except Exception as e:
-                logger.error(
-                    f"Error downloading image {att.filename}: {e}", 
-                    exc_info=True
-                )
-                has_bad_attachments = True
+        logger.debug("Processing images for non-Google provider: %s", provider)
+        binary_attachments = [
+            (att, att.content_type) for att in good_attachments.get("image", [])
+        ]
         
         # Calculate has_bad_attachments for non-Google providers
         if len(message.attachments) > sum(
@@ -249,6 +287,69 @@ async def process_message_attachments(
         ):
             has_bad_attachments = True
     
+    # Download text files and data-URL attachments concurrently
+    text_attachments: List[discord.Attachment] = good_attachments.get("text", [])
+    results = await asyncio.gather(
+        *(
+            _fetch_attachment_text(httpx_client, att)
+            for att in text_attachments
+        ),
+        *(
+            _fetch_attachment_base64(httpx_client, att)
+            for att, _ in binary_attachments
+        ),
+        return_exceptions=True
+    )
+    text_results = results[:len(text_attachments)]
+    encoded_results = results[len(text_attachments):]
+    
+    # Build text content
+    text_parts = []
+    if message.content:
+        text_parts.append(message.content)
+    
+    for embed in message.embeds:
+        if embed.description:
+            text_parts.append(embed.description)
+    
+    # Process text file attachments
+    for att, file_text in zip(text_attachments, text_results):
+        if isinstance(file_text, BaseException):
+            logger.error(
+                f"Error fetching text from attachment {att.filename}: "
+                f"{file_text}", 
+                exc_info=file_text
+            )
+            has_bad_attachments = True
+            continue
+        # Escaping never shortens text, so anything past max_text would be
+        # cut from the final content anyway
+        text_parts.append(
+            f'<text_file name="{html.escape(att.filename)}">\n'
+            f'{html.escape(file_text[:max_text])}\n'
+            f'</text_file>'
+        )
+    
+    text_content = "\n".join(text_parts)
+    
+    # Remove bot mention if it starts the message
+    without_mention = text_content.removeprefix(bot_user.mention)
+    if without_mention is not text_content:
+        text_content = without_mention.lstrip()
+    
+    # Wrap encoded attachments as data URLs
+    # (LiteLLM uses image_url for all files)
+    images: List[Dict[str, Any]] = []
+    for (att, mime_type), encoded in zip(binary_attachments, encoded_results):
+        if isinstance(encoded, BaseException):
+            logger.error(
+                f"Error downloading attachment {att.filename}: {encoded}", 
+                exc_info=encoded
+            )
+            has_bad_attachments = True
+            continue
+        images.append(_image_url_dict(f"data:{mime_type};base64,{encoded}"))
+    
     logger.info(
         f"Processed {len(images)} attachments, "
         f"has_bad_attachments={has_bad_attachments}"
@@ -256,9 +357,201 @@ async def process_message_attachments(
     return text_content[:max_text], images, has_bad_attachments
 
 
+@functools.lru_cache(maxsize=64)
+def _model_capabilities(model: str, provider: str) -> Tuple[bool, bool, bool]:
+    """
+    Determine what a model/provider pair accepts in conversation context.
+    
+    Args:
+        model: Model name
+        provider: Provider name
+        
+    Returns:
+        Tuple containing:
+        - Whether the model accepts images
+        - Whether the provider accepts usernames
+        - Whether the model is a grok model
+    """
+    model = model.lower()
+    provider = provider.lower()
+    accept_images = any(tag in model for tag in VISION_MODEL_TAGS)
+    accept_usernames = any(
+        tag in provider for tag in PROVIDERS_SUPPORTING_USERNAMES
+    )
+    is_grok_model = "grok" in model
+    return accept_images, accept_usernames, is_grok_model
+
+
+def _escape_prompt_text(text: str) -> str:
+    """
+    Escape user-supplied text before embedding it in an augmented prompt.
+    
+    Args:
+        text: Raw text from the user
+        
+    Returns:
+        HTML-escaped text
+    """
+    return html.escape(text)
+
+
+@functools.lru_cache(maxsize=1)
+def _format_date(day: date) -> str:
+    """
+    Format a date for the system prompt, cached since it changes daily.
+    
+    Args:
+        day: Date to format
+        
+    Returns:
+        Date formatted like "January 01, 2025"
+    """
+    return day.strftime('%B %d, %Y')
+
+
+async def _fetch_attachment_base64(
+    httpx_client: httpx.AsyncClient,
+    att: discord.Attachment
+) -> str:
+    """
+    Stream an attachment and base64-encode it chunk by chunk.
+    
+    Results are cached by attachment ID, so re-traversing a conversation
+    does not download the same attachment again. Large attachments are
+    encoded in a worker thread, one chunk at a time, while the next chunk
+    downloads.
+    
+    Args:
+        httpx_client: HTTP client
+        att: Discord attachment
+        
+    Returns:
+        Base64-encoded attachment content
+    """
+    cache_key = ("base64", att.id, att.size)
+    if (cached := _attachment_cache.get(cache_key)) is not None:
+        return cached
+    
+    offload = att.size >= BASE64_OFFLOAD_THRESHOLD_BYTES
+    encoded = bytearray()
+    pending: Optional[asyncio.Future] = None
+    async with _attachment_download_semaphore:
+        async with httpx_client.stream("GET", att.url) as response:
+            # Error pages must not be encoded or cached as the attachment
+            response.raise_for_status()
+            try:
+                async for chunk in response.aiter_bytes(
+                    chunk_size=BASE64_STREAM_CHUNK_SIZE
+                ):
+                    if not offload:
+                        encoded += _b64encode(chunk)
+                        continue
+                    # Collect the previous chunk, then leave this one
+                    # encoding in a thread while the next one is read
+                    if pending is not None:
+                        encoded += await pending
+                    pending = asyncio.ensure_future(
+                        asyncio.to_thread(_b64encode, chunk)
+                    )
+                if pending is not None:
+                    encoded += await pending
+            finally:
+                if pending is not None and not pending.done():
+                    pending.cancel()
+    result = encoded.decode('ascii')
+    _attachment_cache.put(cache_key, result)
+    return result
+
+
+async def _fetch_attachment_text(
+    httpx_client: httpx.AsyncClient,
+    att: discord.Attachment
+) -> str:
+    """
+    Stream a text attachment and decode it.
+    
+    Results are cached by attachment ID, like _fetch_attachment_base64.
+    
+    Args:
+        httpx_client: HTTP client
+        att: Discord attachment
+        
+    Returns:
+        Decoded text content
+    """
+    cache_key = ("text", att.id, att.size)
+    if (cached := _attachment_cache.get(cache_key)) is not None:
+        return cached
+    
+    async with _attachment_download_semaphore:
+        async with httpx_client.stream("GET", att.url) as response:
+            response.raise_for_status()
+            result = "".join([part async for part in response.aiter_text()])
+    _attachment_cache.put(cache_key, result)
+    return result
+
+
+async def _fetch_recent_messages(
+    new_msg: Message,
+    limit: int
+) -> Dict[int, Message]:
+    """
+    Fetch the messages preceding a message in its channel in one request.
+    
+    Args:
+        new_msg: Discord message to look back from
+        limit: Maximum number of messages to fetch
+        
+    Returns:
+        Dictionary mapping message IDs to messages (empty on failure)
+    """
+    try:
+        return {
+            msg.id: msg
+            async for msg in new_msg.channel.history(
+                before=new_msg, limit=limit
+            )
+        }
+    except (discord.Forbidden, discord.HTTPException, AttributeError) as e:
+        logger.warning(
+            f"Could not prefetch channel history for message {new_msg.id}: {e}"
+        )
+        return {}
+
+
+def _find_cached_next_message(
+    curr_msg: Message,
+    recent_msgs: Optional[Dict[int, Message]] = None
+) -> Optional[Message]:
+    """
+    Find the next message in a conversation chain without network access.
+    
+    Args:
+        curr_msg: Current Discord message
+        recent_msgs: Prefetched channel messages keyed by ID
+        
+    Returns:
+        The next message if it is already available locally, otherwise None
+        (find_next_message must then be awaited to know for sure)
+    """
+    if curr_msg.reference:
+        return (
+            curr_msg.reference.cached_message
+            or (recent_msgs or {}).get(curr_msg.reference.message_id)
+        )
+    
+    if (curr_msg.channel.type == discord.ChannelType.public_thread
+            and curr_msg.channel.parent
+            and curr_msg.channel.parent.type == discord.ChannelType.text):
+        return curr_msg.channel.starter_message
+    
+    return None
+
+
 async def find_next_message(
     curr_msg: Message,
-    bot_user: ClientUser
+    bot_user: ClientUser,
+    recent_msgs: Optional[Dict[int, Message]] = None
 ) -> Optional[Message]:
     """
     Find the next message in a conversation chain.
@@ -266,6 +559,8 @@ async def find_next_message(
     Args:
         curr_msg: Current Discord message
         bot_user: Bot user object
+        recent_msgs: Prefetched channel messages keyed by ID, checked before
+            falling back to a per-message fetch
         
     Returns:
         The next message in the chain or None
@@ -277,6 +572,7 @@ async def find_next_message(
             if next_msg_id:
                 return (
                     curr_msg.reference.cached_message
+                    or (recent_msgs or {}).get(next_msg_id)
                     or await curr_msg.channel.fetch_message(next_msg_id)
                 )
                 
@@ -314,7 +610,7 @@ async def build_conversation_context(
     config: Dict[str, Any],
     httpx_client: httpx.AsyncClient,
     allowed_file_types: Tuple[str, ...]
-) -> Tuple[List[Dict[str, Any]], set[str]]:
+) -> Tuple[List[Dict[str, Any]], set[str], Optional[int]]:
     """
     Build conversation context from message chain.
     
@@ -330,19 +626,14 @@ async def build_conversation_context(
         Tuple containing:
         - List of messages for LLM context
         - Set of user warnings
+        - Index of the latest user message in the list (None if absent)
     """
     # Get provider from config
     provider: str = config["provider"]
     
     # Determine model capabilities
-    accept_images: bool = any(
-        x in config["model"].lower() for x in [
-            "gpt-4o", "claude-3", "gemini", "pixtral", 
-            "llava", "vision", "vl", "grok"
-        ]
-    )
-    accept_usernames: bool = any(
-        x in provider.lower() for x in ["openai"]
+    accept_images, accept_usernames, is_grok_model = _model_capabilities(
+        config["model"], provider
     )
     
     # Get configuration limits
@@ -350,9 +641,18 @@ async def build_conversation_context(
     max_images: int = config["max_images"] if accept_images else 0
     max_messages: int = config["max_messages"]
     
-    messages: List[Dict[str, Any]] = []
+    # Messages are found newest-first, so prepend to keep chronological order
+    messages: Deque[Dict[str, Any]] = deque()
     user_warnings: set[str] = set()
     curr_msg: Optional[Message] = new_msg
+    # Number of messages found before the latest user message
+    last_user_pos: Optional[int] = None
+    
+    # Reply chains usually point at recent messages in the same channel, so
+    # pull them in one round-trip instead of fetching each step separately
+    recent_msgs: Dict[int, Message] = {}
+    if new_msg.reference and new_msg.reference.cached_message is None:
+        recent_msgs = await _fetch_recent_messages(new_msg, max_messages)
     
     # Traverse message chain to build context
     while curr_msg is not None and len(messages) < max_messages:
@@ -381,10 +681,14 @@ async def build_conversation_context(
                     curr_msg.author.id if curr_node.role == "user" else None
                 )
                 
-                # Find next message in conversation chain
+                # Find next message in conversation chain, only awaiting
+                # a fetch when it is not available locally
                 try:
-                    curr_node.next_msg = await find_next_message(
-                        curr_msg, bot_user
+                    curr_node.next_msg = (
+                        _find_cached_next_message(curr_msg, recent_msgs)
+                        or await find_next_message(
+                            curr_msg, bot_user, recent_msgs
+                        )
                     )
                 except Exception as e:
                     logger.error(
@@ -393,19 +697,29 @@ async def build_conversation_context(
                     )
                     curr_node.fetch_next_failed = True
             
+            # Truncate text and images once per node (slicing a str that is
+            # already short enough returns it as-is; a list slice always
+            # copies, so only slice images when over the limit)
+            truncated_text: str = curr_node.text[:max_text]
+            truncated_images: List[Dict[str, Any]] = (
+                curr_node.images
+                if len(curr_node.images) <= max_images
+                else curr_node.images[:max_images]
+            )
+            
             # Format message content for LLM API
-            if curr_node.images[:max_images]:
+            if truncated_images:
                 content: List[Dict[str, Any]] = (
-                    ([dict(type="text", text=curr_node.text[:max_text])]
-                     if curr_node.text[:max_text]
+                    ([dict(type="text", text=truncated_text)]
+                     if truncated_text
                      else []) +
-                    curr_node.images[:max_images]
+                    truncated_images
                 )
             else:
-                content: str = curr_node.text[:max_text]
+                content: str = truncated_text
                 
             # Add message to context if it has content
-            if content != "":
+            if content:
                 message: Dict[str, Any] = dict(
                     content=content,
                     role=curr_node.role,
@@ -415,7 +729,9 @@ async def build_conversation_context(
                 )
                 if accept_usernames and curr_node.user_id is not None:
                     message["name"] = str(curr_node.user_id)
-                messages.append(message)
+                if last_user_pos is None and curr_node.role == "user":
+                    last_user_pos = len(messages)
+                messages.appendleft(message)
             
             # Add warnings if needed
             if len(curr_node.text) > max_text:
@@ -459,16 +775,16 @@ async def build_conversation_context(
             # Move to next message in chain
             curr_msg = curr_node.next_msg
 
-    # Reverse messages for chronological order
-    messages = messages[::-1]
+    last_user_idx: Optional[int] = (
+        len(messages) - 1 - last_user_pos
+        if last_user_pos is not None else None
+    )
     
     # Add system prompt if available and model is not grok
     if system_prompt := config["system_prompt"]:
-        # Check if the model is grok
-        model = config["model"].lower()
-        if "grok" not in model:
+        if not is_grok_model:
             system_prompt_extras: List[str] = [
-                f"Today's date: {dt.now().strftime('%B %d, %Y')}."
+                f"Today's date: {_format_date(dt.now().date())}."
             ]
             if accept_usernames:
                 system_prompt_extras.append(
@@ -477,11 +793,15 @@ async def build_conversation_context(
             full_system_prompt: str = "\n".join(
                 [system_prompt] + system_prompt_extras
             )
-            messages.insert(0, dict(role="system", content=full_system_prompt))
+            messages.appendleft(dict(role="system", content=full_system_prompt))
+            if last_user_idx is not None:
+                last_user_idx += 1
         else:
-            logger.info(f"Model '{model}' is grok, not sending system prompt")
+            logger.info(
+                f"Model '{config['model']}' is grok, not sending system prompt"
+            )
         
-    return messages, user_warnings
+    return list(messages), user_warnings, last_user_idx
 
 
 async def handle_lens_sauce_commands(
@@ -491,7 +811,8 @@ async def handle_lens_sauce_commands(
     messages: List[Dict[str, Any]],
     api_key_manager: APIKeyManager,
     httpx_client: httpx.AsyncClient,
-    config: Dict[str, Any]
+    config: Dict[str, Any],
+    last_user_idx: Optional[int] = None
 ) -> Optional[str]:
     """
     Handle lens and sauce commands.
@@ -504,6 +825,7 @@ async def handle_lens_sauce_commands(
         api_key_manager: API key manager instance
         httpx_client: HTTP client
         config: Configuration dictionary
+        last_user_idx: Index of the latest user message in messages
         
     Returns:
         Error message if any, None on success
@@ -553,13 +875,16 @@ async def handle_lens_sauce_commands(
     prefix_len = len(cmd_type)
     user_message_content = user_content[prefix_len:].lstrip()
     
-    augmented_user_message = (
-        f"User Query: {html.escape(user_message_content)}\n\n"
-        f"{results_tag.capitalize()}:\n{formatted_results}"
-    )
+    augmented_user_message = COMMAND_PROMPT_TEMPLATE.format_map({
+        "query": _escape_prompt_text(user_message_content),
+        "results_tag": results_tag.capitalize(),
+        "results": formatted_results,
+    })
     
     # Update the user message in the context
-    _update_user_message_content(messages, augmented_user_message)
+    _update_user_message_content(
+        messages, augmented_user_message, user_msg_index=last_user_idx
+    )
     
     msg_nodes[new_msg.id].text = augmented_user_message
     msg_nodes[new_msg.id].internet_used = True
@@ -572,7 +897,8 @@ async def handle_lens_sauce_commands(
 
 def _update_user_message_content(
     messages: List[Dict[str, Any]], 
-    new_content: str
+    new_content: str,
+    user_msg_index: Optional[int] = None
 ) -> None:
     """
     Update the user message content in the messages list.
@@ -580,21 +906,35 @@ def _update_user_message_content(
     Args:
         messages: List of message objects
         new_content: New content to set
+        user_msg_index: Index of the user message if already known; when
+            omitted (or not pointing at a user message) the list is scanned
+            from the end for the last user message
     """
-    for message in reversed(messages):
-        if message['role'] == 'user':
-            if isinstance(message['content'], list):
-                for part in message['content']:
-                    if part.get('type') == 'text':
-                        part['text'] = new_content
-                        break
-                else:
-                    message['content'].insert(
-                        0, {'type': 'text', 'text': new_content}
-                    )
-            else:
-                message['content'] = new_content
-            break
+    message: Optional[Dict[str, Any]] = None
+    if user_msg_index is not None and messages:
+        candidate = messages[user_msg_index]
+        if candidate['role'] == 'user':
+            message = candidate
+    
+    if message is None:
+        for candidate in reversed(messages):
+            if candidate['role'] == 'user':
+                message = candidate
+                break
+        else:
+            return
+    
+    if isinstance(message['content'], list):
+        for part in message['content']:
+            if part.get('type') == 'text':
+                part['text'] = new_content
+                break
+        else:
+            message['content'].insert(
+                0, {'type': 'text', 'text': new_content}
+            )
+    else:
+        message['content'] = new_content
 
 
 async def handle_regular_message(
@@ -603,7 +943,8 @@ async def handle_regular_message(
     messages: List[Dict[str, Any]],
     api_key_manager: APIKeyManager,
     httpx_client: httpx.AsyncClient,
-    config: Dict[str, Any]
+    config: Dict[str, Any],
+    last_user_idx: Optional[int] = None
 ) -> None:
     """
     Handle regular user messages (non-lens, non-sauce).
@@ -615,6 +956,7 @@ async def handle_regular_message(
         api_key_manager: API key manager instance
         httpx_client: HTTP client
         config: Configuration dictionary
+        last_user_idx: Index of the latest user message in messages
     """
     # Check for URLs in the message
     urls_in_message = extract_urls_from_text(new_msg.content)
@@ -629,7 +971,8 @@ async def handle_regular_message(
             urls_in_message,
             api_key_manager,
             httpx_client,
-            config
+            config,
+            last_user_idx
         )
     else:
         # Handle web search if needed
@@ -639,10 +982,27 @@ async def handle_regular_message(
             messages,
             api_key_manager,
             httpx_client,
-            config
+            config,
+            last_user_idx
         )
 
 
+def _strip_reddit_prefix(url_kind: str, content: str) -> str:
+    """
+    Remove the "Reddit Content:" prefix from fetched Reddit content.
+    
+    Args:
+        url_kind: URL kind as returned by classify_url
+        content: Fetched URL content
+        
+    Returns:
+        The content without the prefix
+    """
+    if url_kind == "reddit":
+        return content.removeprefix("Reddit Content:\n")
+    return content
+
+
 async def _handle_urls_in_message(
     new_msg: Message,
     msg_nodes: Dict[int, MsgNode],
@@ -650,7 +1010,8 @@ async def _handle_urls_in_message(
     urls_in_message: List[str],
     api_key_manager: APIKeyManager,
     httpx_client: httpx.AsyncClient,
-    config: Dict[str, Any]
+    config: Dict[str, Any],
+    last_user_idx: Optional[int] = None
 ) -> None:
     """
     Handle URLs found in a message.
@@ -663,6 +1024,7 @@ async def _handle_urls_in_message(
         api_key_manager: API key manager instance
         httpx_client: HTTP client
         config: Configuration dictionary
+        last_user_idx: Index of the latest user message in messages
     """
     logger.info(
         f"Found {len(urls_in_message)} URLs in message {new_msg.id}"
@@ -676,55 +1038,49 @@ async def _handle_urls_in_message(
     # Use the new consistent format for all URL types
     if len(urls_in_message) == 1:
         # Handle single URL case with the new format
-        content_type = "web"
-        url = urls_in_message[0]
-        content = contents[0]
-        
-        # Determine content type based on URL
-        if 'youtube.com' in url or 'youtu.be' in url:
-            content_type = "youtube"
-        elif 'reddit.com' in url or 'redd.it' in url:
-            content_type = "reddit"
-            # Remove the "Reddit Content:" prefix if present
-            if content.startswith("Reddit Content:\n"):
-                content = content.replace("Reddit Content:\n", "", 1)
+        content_type = classify_url(urls_in_message[0])
+        content = _strip_reddit_prefix(content_type, contents[0])
         
         # Format as per the requested format
-        augmented_user_message = (
-            f"answer the user query based on the {content_type} content. don't generate images.\n\n"
-            f"user query:\n{html.escape(new_msg.content)}\n\n"
-            f"{content_type} content:\n{content}"
-        )
+        header = URL_PROMPT_HEADER_TEMPLATE.format_map({
+            "kind": content_type,
+            "query": _escape_prompt_text(new_msg.content),
+        })
+        augmented_user_message = header + content
     else:
         # Multiple URLs - use the same format but combine all URL content
-        augmented_user_message = (
-            f"answer the user query based on the web content. don't generate images.\n\n"
-            f"user query:\n{html.escape(new_msg.content)}\n\n"
-            f"web content:\n"
-        )
+        parts: List[str] = [
+            URL_PROMPT_HEADER_TEMPLATE.format_map({
+                "kind": "web",
+                "query": _escape_prompt_text(new_msg.content),
+            })
+        ]
         
         for idx, (url, content) in enumerate(
             zip(urls_in_message, contents), start=1
         ):
-            # Determine content type based on URL
-            content_type = "Web"
-            if 'youtube.com' in url or 'youtu.be' in url:
-                content_type = "YouTube"
-            elif 'reddit.com' in url or 'redd.it' in url:
-                content_type = "Reddit"
-                # Remove the "Reddit Content:" prefix if present
-                if content.startswith("Reddit Content:\n"):
-                    content = content.replace("Reddit Content:\n", "", 1)
-                    
-            augmented_user_message += (
-                f"Source {idx} ({content_type}):\n"
-                f"URL: {html.escape(url)}\n"
-                f"{content}\n\n"
-            )
+            url_kind = classify_url(url)
+            content = _strip_reddit_prefix(url_kind, content)
+            chunk = URL_SOURCE_TEMPLATE.format_map({
+                "idx": idx,
+                "label": URL_KIND_LABELS[url_kind],
+                "url": _escape_prompt_text(url),
+                "content": content,
+            })
+            parts.append(chunk)
+        
+        augmented_user_message = "".join(parts)
     
     # Update the user message
-    _update_user_message_content(messages, augmented_user_message)
-    msg_nodes[new_msg.id].text = augmented_user_message
+    _update_user_message_content(
+        messages, augmented_user_message, user_msg_index=last_user_idx
+    )
+    # The current turn gets the full content. Later turns only read the
+    # stored text up to max_text; one extra character is kept so they
+    # still warn that it was cut.
+    msg_nodes[new_msg.id].text = (
+        augmented_user_message[:config["max_text"] + 1]
+    )
     msg_nodes[new_msg.id].internet_used = True
 
 
@@ -734,7 +1090,8 @@ async def _handle_web_search(
     messages: List[Dict[str, Any]],
     api_key_manager: APIKeyManager,
     httpx_client: httpx.AsyncClient,
-    config: Dict[str, Any]
+    config: Dict[str, Any],
+    last_user_idx: Optional[int] = None
 ) -> None:
     """
     Handle web search for a message if needed.
@@ -746,6 +1103,7 @@ async def _handle_web_search(
         api_key_manager: API key manager instance
         httpx_client: HTTP client
         config: Configuration dictionary
+        last_user_idx: Index of the latest user message in messages
     """
     logger.info(f"Checking if web search is needed for message {new_msg.id}")
     latest_user_query = await rephrase_query(
@@ -757,27 +1115,52 @@ async def _handle_web_search(
             f"Web search needed for message {new_msg.id}, "
             f"query: {latest_user_query}"
         )
-        split_queries = await split_query(
-            latest_user_query, config, api_key_manager
-        )
+        async with asyncio.TaskGroup() as tg:
+            split_task = tg.create_task(
+                split_query(latest_user_query, config, api_key_manager)
+            )
+            # The splitter keeps the original query among the ones it
+            # returns, so start searching for it while the split runs
+            speculative_search_task = tg.create_task(
+                search_query(
+                    latest_user_query, api_key_manager, httpx_client,
+                    config=config
+                )
+            )
+            split_queries = await split_task
+            use_speculative_search = latest_user_query in split_queries
+            if not use_speculative_search:
+                speculative_search_task.cancel()
+        
         msg_nodes[new_msg.id].serper_queries = split_queries
         msg_nodes[new_msg.id].internet_used = True
         logger.info(
             f"Split into {len(split_queries)} queries: {split_queries}"
         )
         
+        escaped_query = _escape_prompt_text(new_msg.content)
+        pending_searches: Optional[Dict[str, asyncio.Task]] = None
+        if use_speculative_search:
+            pending_searches = {latest_user_query: speculative_search_task}
+        else:
+            logger.info(
+                f"Speculative search discarded for message {new_msg.id}, "
+                f"the split dropped the original query"
+            )
         aggregated_results = await handle_search_queries(
-            split_queries, api_key_manager, httpx_client, config=config
+            split_queries, api_key_manager, httpx_client, config=config,
+            pending_searches=pending_searches
         )
         
-        augmented_user_message = (
-            f"answer the user query based on the aggregated search results. don't generate images.\n\n"
-            f"user query:\n{html.escape(new_msg.content)}\n\n"
-            f"{aggregated_results}"
-        )
+        augmented_user_message = SEARCH_PROMPT_TEMPLATE.format_map({
+            "query": escaped_query,
+            "results": aggregated_results,
+        })
         
         # Update the user message
-        _update_user_message_content(messages, augmented_user_message)
+        _update_user_message_content(
+            messages, augmented_user_message, user_msg_index=last_user_idx
+        )
         msg_nodes[new_msg.id].text = augmented_user_message
     else:
         logger.info(f"Web search not needed for message {new_msg.id}")
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Rate Limiter Module
+
+This module defines the AsyncTokenBucket class used to pace message edits
+so they stay within Discord's per-channel rate limits instead of running
+into 429 responses.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from typing import Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket rate limiter keyed by an arbitrary hashable, such as a
+    channel ID.
+
+    Each key starts with `rate` tokens and regains them continuously over
+    `period` seconds. Waiters on the same key are served in order. Keys
+    whose bucket has fully refilled are forgotten, so state is only kept
+    for recently used keys.
+    """
+
+    def __init__(self, rate: int = 5, period: float = 5.0) -> None:
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Number of acquisitions allowed per period
+            period: Length of the period in seconds
+        """
+        self.rate = rate
+        self.period = period
+        # Locks live only as long as someone is waiting on or holding them
+        self.locks: "weakref.WeakValueDictionary[Hashable, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        # Key -> (tokens available, monotonic time they were computed at)
+        self._buckets: Dict[Hashable, Tuple[float, float]] = {}
+        self._next_prune: float = time.monotonic() + period
+
+    def _refill(self, key: Hashable, now: float) -> float:
+        """
+        Return the tokens available for a key at the given time.
+
+        Args:
+            key: Bucket key
+            now: Current monotonic time
+
+        Returns:
+            Number of tokens available
+        """
+        tokens, updated = self._buckets.get(key, (float(self.rate), now))
+        if now <= updated:
+            # Still inside a server-imposed backoff
+            return tokens - (updated - now) * self.rate / self.period
+        return min(
+            float(self.rate), tokens + (now - updated) * self.rate / self.period
+        )
+
+    def _prune(self, now: float) -> None:
+        """
+        Forget buckets that have fully refilled, at most once per period.
+
+        A full bucket behaves exactly like a key that was never seen.
+
+        Args:
+            now: Current monotonic time
+        """
+        if now < self._next_prune:
+            return
+        self._next_prune = now + self.period
+        full = [
+            key for key in self._buckets
+            if self._refill(key, now) >= self.rate
+        ]
+        for key in full:
+            del self._buckets[key]
+
+    async def acquire(self, key: Hashable) -> None:
+        """
+        Wait until a token is available for the key and take it.
+
+        Args:
+            key: Bucket key
+        """
+        lock = self.locks.get(key)
+        if lock is None:
+            lock = self.locks[key] = asyncio.Lock()
+        async with lock:
+            while True:
+                now = time.monotonic()
+                tokens = self._refill(key, now)
+                if tokens >= 1:
+                    self._prune(now)
+                    self._buckets[key] = (tokens - 1, now)
+                    return
+                wait = (1 - tokens) * self.period / self.rate
+                logger.debug(f"Rate limit reached for {key}, waiting {wait:.2f}s")
+                await asyncio.sleep(wait)
+
+    def backoff(self, key: Hashable, retry_after: float) -> None:
+        """
+        Empty the bucket for a key after the server reported a rate limit.
+
+        Args:
+            key: Bucket key
+            retry_after: Seconds the server asked to wait
+        """
+        logger.warning(f"Rate limited on {key}, backing off for {retry_after:.2f}s")
+        self._buckets[key] = (0.0, time.monotonic() + retry_after)
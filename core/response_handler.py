@@ -6,9 +6,11 @@ handling streaming, edits, and content chunking.
 """
 
 import asyncio
+import functools
+import io
 import logging
-from datetime import datetime as dt
-from typing import Dict, Any, List, Optional, Set, Tuple, AsyncGenerator
+import time
+from typing import Dict, Any, FrozenSet, List, Optional, Set, Tuple, AsyncGenerator
 
 import discord
 from discord import Message, AllowedMentions
@@ -16,15 +18,139 @@ from discord import Message, AllowedMentions
 from core.constants import (
     STREAMING_INDICATOR,
     EDIT_DELAY_SECONDS,
+    EMBED_DESCRIPTION_LIMIT,
     EMBED_COLOR_COMPLETE,
     EMBED_COLOR_INCOMPLETE
 )
 from core.discord_ui import OutputView
 from core.message_node import MsgNode
+from core.rate_limiter import AsyncTokenBucket
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Room left for response text in an embed that ends with the indicator
+_INDICATOR_LEN: int = len(STREAMING_INDICATOR)
+_CONTENT_LIMIT: int = EMBED_DESCRIPTION_LIMIT - _INDICATOR_LEN
+
+# Yield to the event loop after this many stream chunks, in case the
+# provider delivers a burst that never suspends the loop on its own
+STREAM_YIELD_INTERVAL: int = 32
+
+# Discord allows about 5 message edits per 5 seconds in a channel
+_edit_bucket = AsyncTokenBucket(rate=5, period=5.0)
+
+
+@functools.lru_cache(maxsize=128)
+def _sorted_warnings(warnings: FrozenSet[str]) -> Tuple[str, ...]:
+    """
+    Sort warnings for display, cached since most responses share a few
+    warning sets.
+    
+    Args:
+        warnings: The warning messages
+        
+    Returns:
+        The warnings in sorted order
+    """
+    return tuple(sorted(warnings))
+
+
+@functools.lru_cache(maxsize=64)
+def _footer_text(model_name: str, internet_used: bool) -> str:
+    """
+    Build the embed footer naming the model and whether internet was used,
+    cached so the grok check runs once per model.
+    
+    Args:
+        model_name: Name of the model being used
+        internet_used: Whether internet search was used
+        
+    Returns:
+        The footer text
+    """
+    # Grok models search on their own, so internet use is not reported
+    if 'grok' in model_name.lower():
+        return f"Model: {model_name}"
+    return f"Model: {model_name} | " + (
+        "Internet used" if internet_used else "Internet NOT used"
+    )
+
+
+def _build_embed(
+    description: str,
+    color: discord.Color,
+    sorted_warnings: Tuple[str, ...],
+    footer_text: str
+) -> discord.Embed:
+    """
+    Build a response embed from precomputed warnings and footer.
+    
+    Args:
+        description: The embed description
+        color: The embed color
+        sorted_warnings: Warning messages to add as fields, in order
+        footer_text: Text for the embed footer
+        
+    Returns:
+        The Discord embed
+    """
+    embed = discord.Embed(description=description, color=color)
+    for warning in sorted_warnings:
+        embed.add_field(name=warning, value="", inline=False)
+    embed.set_footer(text=footer_text)
+    return embed
+
+
+async def _register_response_node(
+    msg_nodes: Dict[int, MsgNode],
+    response_msg: Message,
+    new_msg: Message,
+    internet_used: bool = False
+) -> None:
+    """
+    Add a locked node for a new response message, held until its text is
+    final.
+    
+    The lock is fresh and nothing can await it before this returns, so
+    acquiring it takes asyncio.Lock's uncontended path and never yields.
+    
+    Args:
+        msg_nodes: Dictionary of message nodes
+        response_msg: The response message
+        new_msg: The user message being responded to
+        internet_used: Whether internet search was used
+    """
+    node = msg_nodes[response_msg.id] = MsgNode(
+        next_msg=new_msg,
+        internet_used=internet_used,
+    )
+    await node.lock.acquire()
+
+
+async def _paced_edit(message: Message, **kwargs: Any) -> Message:
+    """
+    Edit a message once its channel's edit bucket has a token available.
+    
+    Args:
+        message: The message to edit
+        **kwargs: Arguments passed to Message.edit
+        
+    Returns:
+        The edited message
+    """
+    channel_id = message.channel.id
+    await _edit_bucket.acquire(channel_id)
+    try:
+        return await message.edit(**kwargs)
+    except discord.HTTPException as e:
+        if e.status == 429:
+            headers = getattr(e.response, "headers", None) or {}
+            _edit_bucket.backoff(
+                channel_id, float(headers.get("Retry-After", _edit_bucket.period))
+            )
+        raise
+
 
 class ResponseHandler:
     """
@@ -57,9 +183,9 @@ class ResponseHandler:
             The created response message
         """
         try:
-            logger.info(
-                f"Creating initial response message by editing progress "
-                f"message {progress_message.id}"
+            logger.debug(
+                "Creating initial response message by editing progress "
+                "message %s", progress_message.id
             )
             response_msg = await progress_message.edit(
                 content=None,
@@ -68,11 +194,10 @@ class ResponseHandler:
                 allowed_mentions=allowed_mentions
             )
             
-            msg_nodes[response_msg.id] = MsgNode(
-                next_msg=new_msg,
-                internet_used=msg_nodes[new_msg.id].internet_used,
+            await _register_response_node(
+                msg_nodes, response_msg, new_msg,
+                msg_nodes[new_msg.id].internet_used
             )
-            await msg_nodes[response_msg.id].lock.acquire()
             
             return response_msg
         except Exception as e:
@@ -103,9 +228,9 @@ class ResponseHandler:
             The created continuation message
         """
         try:
-            logger.info(
-                f"Creating continuation message as reply to message "
-                f"{prev_msg.id}"
+            logger.debug(
+                "Creating continuation message as reply to message %s",
+                prev_msg.id
             )
             response_msg = await prev_msg.reply(
                 embed=embed,
@@ -114,11 +239,10 @@ class ResponseHandler:
                 allowed_mentions=allowed_mentions
             )
             
-            msg_nodes[response_msg.id] = MsgNode(
-                next_msg=new_msg,
-                internet_used=msg_nodes[new_msg.id].internet_used,
+            await _register_response_node(
+                msg_nodes, response_msg, new_msg,
+                msg_nodes[new_msg.id].internet_used
             )
-            await msg_nodes[response_msg.id].lock.acquire()
             
             return response_msg
         except Exception as e:
@@ -135,7 +259,10 @@ class ResponseHandler:
         is_complete: bool,
         model_name: str,
         internet_used: bool,
-        searched_for_text: str = ""
+        searched_for_text: str = "",
+        *,
+        sorted_warnings: Optional[Tuple[str, ...]] = None,
+        footer_text: Optional[str] = None
     ) -> discord.Embed:
         """
         Prepare a Discord embed for a response.
@@ -147,6 +274,9 @@ class ResponseHandler:
             model_name: Name of the model being used
             internet_used: Whether internet search was used
             searched_for_text: Text showing what was searched for (if applicable)
+            sorted_warnings: Precomputed sorted user_warnings, for callers
+                building several embeds for one response
+            footer_text: Precomputed footer text, likewise
             
         Returns:
             The prepared Discord embed
@@ -156,35 +286,17 @@ class ResponseHandler:
         if not is_complete:
             content_with_indicator += STREAMING_INDICATOR
             
-        # Create embed with proper description
-        embed_description = searched_for_text + content_with_indicator
-        
-        embed = discord.Embed(
-            description=embed_description,
-            color=(
-                EMBED_COLOR_COMPLETE if is_complete 
-                else EMBED_COLOR_INCOMPLETE
-            ),
-        )
-        
-        # Add warnings as fields
-        for warning in sorted(user_warnings):
-            embed.add_field(name=warning, value="", inline=False)
+        if sorted_warnings is None:
+            sorted_warnings = _sorted_warnings(frozenset(user_warnings))
+        if footer_text is None:
+            footer_text = _footer_text(model_name, internet_used)
             
-        # Add footer
-        # Check if model is grok
-        is_grok_model = 'grok' in model_name.lower()
-        
-        if is_grok_model:
-            footer_text = f"Model: {model_name}"
-        else:
-            footer_text = f"Model: {model_name} | " + (
-                "Internet used" if internet_used else "Internet NOT used"
-            )
-        
-        embed.set_footer(text=footer_text)
-        
-        return embed
+        return _build_embed(
+            searched_for_text + content_with_indicator,
+            EMBED_COLOR_COMPLETE if is_complete else EMBED_COLOR_INCOMPLETE,
+            sorted_warnings,
+            footer_text
+        )
     
     @staticmethod
     async def handle_streaming_response(
@@ -227,260 +339,199 @@ class ResponseHandler:
             )
             response_msgs: List[Message] = []
             response_contents: List[str] = []
-            prev_chunk: Any = None
-            edit_task: Optional[asyncio.Task] = None
-            last_task_time: float = dt.now().timestamp()
+            # Text buffer and running length of each message; a buffer is
+            # copied into response_contents only when the text is needed
+            response_buffers: List[io.StringIO] = []
+            response_lengths: List[int] = []
+            # Content length of each message as of its last edit
+            edited_lengths: List[int] = []
+            finish_reason: Optional[str] = None
             
-            # Discord embed limit is 4096 characters - calculate max content length for first message
-            # (accounting for searched_for_text and streaming indicator)
-            discord_embed_limit = 4096
-            first_msg_content_limit = discord_embed_limit - len(searched_for_text) - len(STREAMING_INDICATOR)
+            # Max content length for the first message, which also carries
+            # searched_for_text; continuation messages get _CONTENT_LIMIT
+            first_msg_content_limit = _CONTENT_LIMIT - len(searched_for_text)
             
-            # For continuation messages, we don't include searched_for_text
-            cont_msg_content_limit = discord_embed_limit - len(STREAMING_INDICATOR)
-            
-            # Keep track if we've added the searched_for_text
-            searched_for_text_added = False
+            # Warnings and footer are the same for every embed in this response
+            sorted_warnings = _sorted_warnings(frozenset(user_warnings))
+            footer_text = _footer_text(
+                config['model'], msg_nodes[user_message_id].internet_used
+            )
             
-            async for curr_chunk in stream:
-                prev_content = (
-                    prev_chunk.choices[0].delta.content
-                    if (prev_chunk is not None and 
-                        prev_chunk.choices[0].delta.content)
-                    else ""
+            def build_embed(
+                description: str, color: discord.Color
+            ) -> discord.Embed:
+                return _build_embed(
+                    description, color, sorted_warnings, footer_text
                 )
-                curr_content = curr_chunk.choices[0].delta.content or ""
-                
-                # Process content if we have something to work with
-                if response_contents or prev_content:
-                    # Check if we need to start a new message
-                    if not response_contents:
-                        # First message - always create it
-                        response_contents.append("")
-                        searched_for_text_added = True
-                        
-                        # Create initial embed for first message
-                        initial_embed_description = searched_for_text + STREAMING_INDICATOR
-                        
-                        initial_embed = discord.Embed(
-                            description=initial_embed_description,
-                            color=EMBED_COLOR_INCOMPLETE,
+            
+            def embed_description(index: int, suffix: str = "") -> str:
+                text = response_buffers[index].getvalue()
+                response_contents[index] = text
+                # searched_for_text is only shown on the first message;
+                # build the description in one step rather than by repeated +
+                prefix = searched_for_text if index == 0 else ""
+                return f"{prefix}{text}{suffix}"
+            
+            def start_message() -> None:
+                response_contents.append("")
+                response_buffers.append(io.StringIO())
+                response_lengths.append(0)
+                edited_lengths.append(0)
+            
+            # The view reads response_contents by reference, so a single
+            # instance stays current as each edit refreshes the text
+            view = OutputView(
+                response_contents, user_message_content, serper_queries
+            )
+            
+            # Progress edits are made by a single editor task; the stream
+            # loop only appends content and wakes it up. The lock keeps the
+            # editor away from a message while it is being split or finished.
+            edit_event = asyncio.Event()
+            edit_lock = asyncio.Lock()
+            
+            async def editor() -> None:
+                last_edit_time: Optional[float] = None
+                while True:
+                    await edit_event.wait()
+                    if last_edit_time is None:
+                        # The first message was created just before this wake-up
+                        last_edit_time = time.monotonic()
+                    # Space edits EDIT_DELAY_SECONDS apart, letting content
+                    # accumulate so each edit carries a batch
+                    delay = last_edit_time + EDIT_DELAY_SECONDS - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    async with edit_lock:
+                        edit_event.clear()
+                        index = len(response_msgs) - 1
+                        if response_lengths[index] == edited_lengths[index]:
+                            # Nothing new since the last edit
+                            continue
+                        edited_lengths[index] = response_lengths[index]
+                        last_edit_time = time.monotonic()
+                        embed = build_embed(
+                            embed_description(index, STREAMING_INDICATOR),
+                            EMBED_COLOR_INCOMPLETE
                         )
-                        
-                        for warning in sorted(user_warnings):
-                            initial_embed.add_field(name=warning, value="", inline=False)
-                        
-                        # Check if model is grok
-                        is_grok_model = 'grok' in config['model'].lower()
-                        if is_grok_model:
-                            footer_text = f"Model: {config['model']}"
-                        else:
-                            footer_text = f"Model: {config['model']} | " + (
-                                "Internet used" 
-                                if msg_nodes[user_message_id].internet_used 
-                                else "Internet NOT used"
+                        try:
+                            # Every message is created with the view, which
+                            # reads its contents by reference, so progress
+                            # edits leave the components untouched
+                            await _paced_edit(
+                                response_msgs[index],
+                                embed=embed, 
+                                allowed_mentions=allowed_mentions
                             )
-                        initial_embed.set_footer(text=footer_text)
-                        
-                        view = OutputView(
-                            response_contents, user_message_content, serper_queries
+                        except Exception as e:
+                            logger.error(
+                                f"Error editing message {response_msgs[index].id}: {e}", 
+                                exc_info=True
+                            )
+            
+            editor_task = asyncio.create_task(editor())
+            try:
+                chunk_count = 0
+                async for chunk in stream:
+                    chunk_count += 1
+                    if chunk_count % STREAM_YIELD_INTERVAL == 0:
+                        await asyncio.sleep(0)
+                    if chunk.choices[0].finish_reason is not None:
+                        finish_reason = chunk.choices[0].finish_reason
+                    content = chunk.choices[0].delta.content or ""
+                    if not content:
+                        continue
+                    
+                    if not response_msgs:
+                        # First message - create it by editing the progress message
+                        start_message()
+                        initial_embed = build_embed(
+                            searched_for_text + STREAMING_INDICATOR,
+                            EMBED_COLOR_INCOMPLETE
                         )
-                        
-                        # Create first message by editing progress message
                         response_msg = await ResponseHandler.create_response_message(
                             progress_message, initial_embed, view, allowed_mentions, 
                             msg_nodes, new_msg
                         )
                         response_msgs.append(response_msg)
-                        last_task_time = dt.now().timestamp()
-                        logger.info(f"Created initial response message {response_msg.id}")
+                        logger.debug(
+                            "Created initial response message %s", response_msg.id
+                        )
                         
-                    elif len(response_contents[-1] + prev_content) > (
+                    elif response_lengths[-1] + len(content) > (
                             first_msg_content_limit if len(response_contents) == 1 
-                            else cont_msg_content_limit
+                            else _CONTENT_LIMIT
                         ):
-                        # Content would exceed Discord limit - start a new message
-                        response_contents.append("")
-                        
-                        # Only proceed if we have at least one message
-                        if response_msgs:
-                            # Create a new embed for the previous content
-                            prev_embed_description = ""
-                            if len(response_contents) == 2 and searched_for_text:  # For first message only
-                                prev_embed_description = searched_for_text
-                            
-                            prev_embed_description += response_contents[-2] + STREAMING_INDICATOR
-                            
-                            prev_embed = discord.Embed(
-                                description=prev_embed_description,
-                                color=EMBED_COLOR_INCOMPLETE,
-                            )
-                            
-                            for warning in sorted(user_warnings):
-                                prev_embed.add_field(name=warning, value="", inline=False)
-                            
-                            # Check if model is grok
-                            is_grok_model = 'grok' in config['model'].lower()
-                            if is_grok_model:
-                                footer_text = f"Model: {config['model']}"
-                            else:
-                                footer_text = f"Model: {config['model']} | " + (
-                                    "Internet used" 
-                                    if msg_nodes[user_message_id].internet_used 
-                                    else "Internet NOT used"
-                                )
-                            prev_embed.set_footer(text=footer_text)
-                            
-                            view = OutputView(
-                                response_contents, user_message_content, serper_queries
+                        # Content would exceed Discord limit - finish the
+                        # current message and continue in a reply
+                        async with edit_lock:
+                            index = len(response_msgs) - 1
+                            await _paced_edit(
+                                response_msgs[index],
+                                embed=build_embed(
+                                    embed_description(index), EMBED_COLOR_COMPLETE
+                                ), 
+                                view=view, 
+                                allowed_mentions=allowed_mentions
                             )
                             
-                            # Update the last message before creating a continuation
-                            if edit_task is not None and not edit_task.done():
-                                await edit_task
-                                
-                            edit_task = asyncio.create_task(
-                                response_msgs[-1].edit(
-                                    embed=prev_embed, 
-                                    view=view, 
-                                    allowed_mentions=allowed_mentions
-                                )
+                            start_message()
+                            continuation_embed = build_embed(
+                                STREAMING_INDICATOR,  # Just indicator initially
+                                EMBED_COLOR_INCOMPLETE
                             )
-                            await edit_task
-                            
-                            # Create continuation message
-                            continuation_embed = discord.Embed(
-                                description=STREAMING_INDICATOR,  # Just indicator initially
-                                color=EMBED_COLOR_INCOMPLETE,
-                            )
-                            
-                            for warning in sorted(user_warnings):
-                                continuation_embed.add_field(name=warning, value="", inline=False)
-                            
-                            # Check if model is grok
-                            is_grok_model = 'grok' in config['model'].lower()
-                            if is_grok_model:
-                                footer_text = f"Model: {config['model']}"
-                            else:
-                                footer_text = f"Model: {config['model']} | " + (
-                                    "Internet used" 
-                                    if msg_nodes[user_message_id].internet_used 
-                                    else "Internet NOT used"
-                                )
-                            continuation_embed.set_footer(text=footer_text)
-                            
                             response_msg = await ResponseHandler.create_continuation_message(
                                 response_msgs[-1], continuation_embed, view, allowed_mentions, 
                                 msg_nodes, new_msg
                             )
                             response_msgs.append(response_msg)
-                            last_task_time = dt.now().timestamp()
-                            logger.info(f"Created continuation message {response_msg.id}")
-                    
-                    # Add content to current message
-                    if response_contents:  # Safety check to make sure we have messages
-                        response_contents[-1] += prev_content
-                    
-                    # Check if we need to update the message
-                    finish_reason = curr_chunk.choices[0].finish_reason
-                    ready_to_edit = (
-                        (edit_task is None or edit_task.done())
-                        and dt.now().timestamp() - last_task_time >= EDIT_DELAY_SECONDS
-                    )
+                            logger.debug(
+                                "Created continuation message %s", response_msg.id
+                            )
                     
-                    # Calculate if we're approaching Discord's limit for this message
-                    current_len = len(response_contents[-1] + curr_content) if response_contents else 0
-                    limit_for_current_message = (
-                        first_msg_content_limit if response_contents and len(response_contents) == 1
-                        else cont_msg_content_limit
+                    response_buffers[-1].write(content)
+                    response_lengths[-1] += len(content)
+                    edit_event.set()
+                
+                # Stop progress edits, letting an edit in flight complete
+                async with edit_lock:
+                    editor_task.cancel()
+            finally:
+                # Never leave the editor running past this response; wait()
+                # settles it without raising its cancellation here
+                editor_task.cancel()
+                await asyncio.wait([editor_task])
+            
+            # Final edit of the last message without the streaming indicator
+            if response_msgs:
+                is_good_finish = (
+                    finish_reason is not None
+                    and finish_reason.lower() in ("stop", "end_turn")
+                )
+                index = len(response_msgs) - 1
+                try:
+                    await _paced_edit(
+                        response_msgs[index],
+                        embed=build_embed(
+                            embed_description(index),
+                            EMBED_COLOR_COMPLETE if is_good_finish
+                            else EMBED_COLOR_INCOMPLETE
+                        ), 
+                        view=view, 
+                        allowed_mentions=allowed_mentions
                     )
-                    msg_split_incoming = current_len > limit_for_current_message
-                    
-                    is_final_edit = finish_reason is not None or msg_split_incoming
-                    is_good_finish = (
-                        finish_reason is not None and any(
-                            finish_reason.lower() == x for x in ("stop", "end_turn")
-                        )
+                except Exception as e:
+                    logger.error(
+                        f"Error editing message {response_msgs[index].id}: {e}", 
+                        exc_info=True
                     )
-                    
-                    # Only attempt to edit if we have at least one message
-                    if (ready_to_edit or is_final_edit) and response_msgs:
-                        if edit_task is not None and not edit_task.done():
-                            await edit_task
-                        
-                        # Prepare embed description with searched_for_text for first message
-                        embed_description = ""
-                        if searched_for_text and len(response_msgs) > 0 and response_msgs.index(response_msgs[-1]) == 0:
-                            embed_description = searched_for_text
-                        
-                        # Add the content
-                        if response_contents:  # Safety check to ensure we have content
-                            embed_description += response_contents[-1]
-                        
-                        # Add streaming indicator if not final
-                        if not is_final_edit:
-                            embed_description += STREAMING_INDICATOR
-                            
-                        # Create embed with appropriate color
-                        embed = discord.Embed(
-                            description=embed_description,
-                            color=(
-                                EMBED_COLOR_COMPLETE
-                                if msg_split_incoming or is_good_finish
-                                else EMBED_COLOR_INCOMPLETE
-                            ),
-                        )
-                        
-                        # Add warnings and footer
-                        for warning in sorted(user_warnings):
-                            embed.add_field(name=warning, value="", inline=False)
-                        
-                        # Check if model is grok
-                        is_grok_model = 'grok' in config['model'].lower()
-                        if is_grok_model:
-                            footer_text = f"Model: {config['model']}"
-                        else:
-                            footer_text = f"Model: {config['model']} | " + (
-                                "Internet used" 
-                                if msg_nodes[user_message_id].internet_used 
-                                else "Internet NOT used"
-                            )
-                        embed.set_footer(text=footer_text)
-                        
-                        # Create a new view with updated content
-                        view = OutputView(
-                            response_contents, user_message_content, serper_queries
-                        )
-                        
-                        # Edit the message
-                        try:
-                            edit_task = asyncio.create_task(
-                                response_msgs[-1].edit(
-                                    embed=embed, 
-                                    view=view, 
-                                    allowed_mentions=allowed_mentions
-                                )
-                            )
-                            last_task_time = dt.now().timestamp()
-                        except Exception as e:
-                            # Avoid nested IndexError in the error handler
-                            if response_msgs:
-                                logger.error(
-                                    f"Error editing message {response_msgs[-1].id}: {e}", 
-                                    exc_info=True
-                                )
-                            else:
-                                logger.error(
-                                    f"Error editing message (no message ID available): {e}",
-                                    exc_info=True
-                                )
-                
-                # Save current chunk for next iteration
-                prev_chunk = curr_chunk
             
-            # Update message nodes with final text
+            # Update message nodes with final text. Each node links straight
+            # back to the user message, so every one holds the full response,
+            # built once and shared.
+            full_text = "".join(response_contents)
             for response_msg in response_msgs:
-                msg_nodes[response_msg.id].text = "".join(response_contents)
+                msg_nodes[response_msg.id].text = full_text
                 msg_nodes[response_msg.id].lock.release()
             
             logger.info(
@@ -494,13 +545,11 @@ class ResponseHandler:
                 f"Error handling streaming response: {e}", 
                 exc_info=True
             )
-            # Make sure we properly release any locks
+            # Release the locks taken when each response message was created
             for response_msg in response_msgs:
-                if response_msg.id in msg_nodes:
-                    try:
-                        msg_nodes[response_msg.id].lock.release()
-                    except Exception:
-                        pass  # Lock might not be acquired
+                node = msg_nodes.get(response_msg.id)
+                if node is not None and node.lock.locked():
+                    node.lock.release()
             raise
     
     @staticmethod
@@ -535,43 +584,42 @@ class ResponseHandler:
                 response_contents, user_message_content, serper_queries
             )
             
-            for i, content in enumerate(response_contents):
-                # Format URLs to prevent embeds
-                formatted_content = content
-                
+            # Messages are sent one at a time since each continuation is a
+            # reply to the message before it
+            for content in response_contents:
                 if not response_msgs:
                     # First message - edit the progress message
-                    logger.info(
-                        f"Creating initial plain text response by editing "
-                        f"progress message {progress_message.id}"
+                    logger.debug(
+                        "Creating initial plain text response by editing "
+                        "progress message %s", progress_message.id
                     )
                     response_msg = await progress_message.edit(
-                        content=formatted_content,
+                        content=content,
                         view=view,
                         allowed_mentions=allowed_mentions
                     )
-                    msg_nodes[response_msg.id] = MsgNode(next_msg=new_msg)
-                    await msg_nodes[response_msg.id].lock.acquire()
-                    response_msgs.append(response_msg)
                 else:
                     # Continuation message
-                    logger.info(
-                        f"Creating plain text continuation message as reply "
-                        f"to message {response_msgs[-1].id}"
+                    logger.debug(
+                        "Creating plain text continuation message as reply "
+                        "to message %s", response_msgs[-1].id
                     )
                     response_msg = await response_msgs[-1].reply(
-                        content=formatted_content,
+                        content=content,
                         view=view,
                         mention_author=False,
                         allowed_mentions=allowed_mentions
                     )
-                    msg_nodes[response_msg.id] = MsgNode(next_msg=new_msg)
-                    await msg_nodes[response_msg.id].lock.acquire()
-                    response_msgs.append(response_msg)
+                
+                await _register_response_node(msg_nodes, response_msg, new_msg)
+                response_msgs.append(response_msg)
             
-            # Update message nodes with final text
+            # Update message nodes with final text. Each node links straight
+            # back to the user message, so every one holds the full response,
+            # built once and shared.
+            full_text = "".join(response_contents)
             for response_msg in response_msgs:
-                msg_nodes[response_msg.id].text = "".join(response_contents)
+                msg_nodes[response_msg.id].text = full_text
                 msg_nodes[response_msg.id].lock.release()
             
             logger.info(
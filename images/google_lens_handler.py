@@ -9,15 +9,25 @@ It uses url_handler.py to fetch content from URLs.
 
 import asyncio
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import httpx
 
+try:
+    # Much faster decoding of the large SerpApi payloads when available
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 from config.api_key_manager import APIKeyManager
 from search.url_handler import fetch_urls_content
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+# Cap on visual match pages fetched at once across all Lens queries
+MAX_CONCURRENT_LENS_FETCHES: int = 5
+_lens_fetch_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LENS_FETCHES)
+
 
 async def get_google_lens_results(
     image_url: str,
@@ -63,7 +73,7 @@ async def get_google_lens_results(
     # Log request (hiding API key)
     logger_params = params.copy()
     logger_params['api_key'] = '***REDACTED***'
-    logger.debug(f"Google Lens API parameters: {logger_params}")
+    logger.debug("Google Lens API parameters: %s", logger_params)
 
     try:
         logger.info("Sending request to SerpApi Google Lens endpoint")
@@ -73,7 +83,7 @@ async def get_google_lens_results(
             timeout=300
         )
         response.raise_for_status()
-        data: Dict[str, Any] = response.json()
+        data: Dict[str, Any] = _json_loads(response.content)
         
         # Log basic stats about the response
         visual_matches = data.get('visual_matches', [])
@@ -123,31 +133,49 @@ async def process_google_lens_results(
         f"results"
     )
 
-    formatted_results: str = ''
-    
     # Limit to first 10 matches
     matches_to_process = visual_matches[:10]
     
-    # Queue up all fetch tasks
-    tasks: List[asyncio.Task] = []
-    for idx, match in enumerate(matches_to_process, start=1):
-        url: str = match.get('link', '')
-        title: str = match.get('title', '')
-        logger.debug(f"Queueing visual match #{idx}: url={url}, title={title}")
-        tasks.append(
-            process_visual_match(
-                idx, url, title, config, api_key_manager, httpx_client
-            )
-        )
-
     try:
         logger.info(
-            f"Processing {len(tasks)} visual match tasks concurrently"
+            f"Processing {len(matches_to_process)} visual match tasks "
+            f"concurrently"
         )
-        processed_matches: List[str] = await asyncio.gather(*tasks)
         
-        for match_result in processed_matches:
-            formatted_results += match_result
+        # Run all fetch tasks in a task group so that a failure cancels
+        # the remaining fetches instead of leaving them running, and take
+        # each result as soon as its fetch finishes
+        tasks: List[asyncio.Task] = []
+        results_by_idx: Dict[int, str] = {}
+        async with asyncio.TaskGroup() as tg:
+            for idx, match in enumerate(matches_to_process, start=1):
+                url: str = match.get('link', '')
+                title: str = match.get('title', '')
+                logger.debug(
+                    "Queueing visual match #%d: url=%s, title=%s",
+                    idx, url, title
+                )
+                tasks.append(
+                    tg.create_task(
+                        process_visual_match(
+                            idx, url, title, config, api_key_manager,
+                            httpx_client
+                        )
+                    )
+                )
+            
+            for next_done in asyncio.as_completed(tasks):
+                idx, formatted_result = await next_done
+                results_by_idx[idx] = formatted_result
+                logger.debug(
+                    "Visual match #%d ready (%d/%d)",
+                    idx, len(results_by_idx), len(tasks)
+                )
+        
+        # Keep the matches in their ranked order
+        formatted_results = "".join(
+            results_by_idx[idx] for idx in range(1, len(tasks) + 1)
+        )
 
         logger.info("All visual matches processed successfully")
         return formatted_results
@@ -166,7 +194,7 @@ async def process_visual_match(
     config: Dict[str, Any],
     api_key_manager: APIKeyManager,
     httpx_client: httpx.AsyncClient
-) -> str:
+) -> Tuple[int, str]:
     """
     Process a single visual match URL by fetching its content.
 
@@ -179,14 +207,15 @@ async def process_visual_match(
         httpx_client: HTTP client for content fetching.
 
     Returns:
-        A string of formatted results for the visual match.
+        The visual match number and a string of formatted results for it.
     """
-    logger.debug(f"Processing visual match #{idx}: {url}")
+    logger.debug("Processing visual match #%d: %s", idx, url)
     
     try:
-        contents: List[str] = await fetch_urls_content(
-            [url], api_key_manager, httpx_client, config=config
-        )
+        async with _lens_fetch_semaphore:
+            contents: List[str] = await fetch_urls_content(
+                [url], api_key_manager, httpx_client, config=config
+            )
         content = contents[0] if contents else f"Error fetching content from {url}"
         
         formatted_result: str = (
@@ -195,14 +224,14 @@ async def process_visual_match(
             f"Url of visual match {idx} content:\n{content}\n\n"
         )
 
-        logger.debug(f"Finished processing visual match #{idx}")
-        return formatted_result
+        logger.debug("Finished processing visual match #%d", idx)
+        return idx, formatted_result
     except Exception as e:
         logger.error(
             f"Error processing visual match #{idx} ({url}): {e}", 
             exc_info=True
         )
-        return (
+        return idx, (
             f"Visual match {idx}:\nUrl of visual match {idx}: {url}\n"
             f"Error: {str(e)}\n\n"
         )
\ No newline at end of file
@@ -5,14 +5,18 @@ This module handles image generation using the LiteLLM-compatible API.
 It provides a function to generate images based on text prompts.
 """
 
-import asyncio
 import logging
 import os
 import json
 from typing import Dict, Any, Optional, Tuple, Union
 
 import httpx
-import requests
+
+try:
+    # Decode API responses from bytes with orjson when available
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -67,18 +71,24 @@ async def generate_image(
             "n": 1
         }
         
-        logger.debug(f"Making direct API call to Together.ai with payload: {json.dumps(payload)}")
-        
-        # Make the API call in a non-blocking way
-        def make_request():
-            response = requests.post(api_url, headers=headers, json=payload)
-            response.raise_for_status()
-            return response.json()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Making direct API call to Together.ai with payload: %s",
+                json.dumps(payload)
+            )
         
-        # Run in an executor to not block the event loop
-        response_data = await asyncio.to_thread(make_request)
+        # Make the API call on the shared client to reuse pooled connections
+        response = await httpx_client.post(
+            api_url, headers=headers, json=payload, timeout=60.0
+        )
+        response.raise_for_status()
+        response_data = _json_loads(response.content)
         
-        logger.debug(f"Image generation response received: {json.dumps(response_data)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Image generation response received: %s",
+                json.dumps(response_data)
+            )
         
         # Extract the image URL from the response
         if (response_data and 
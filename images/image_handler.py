@@ -2,151 +2,118 @@
 Image Handler Module
 
 Modified image handler that uses SearxNG with a fallback via Serper.
-This module fetches images based on search queries, downloads them and
-returns Discord File objects together with any URLs that failed to download.
+This module fetches images for a search query from Serper, downloads them
+and returns the image bytes together with any URLs that failed to download.
 """
 
-import asyncio
 import logging
 from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
-from discord import File
-from io import BytesIO
+
+try:
+    # Parse Serper image results from bytes with orjson when available
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 from config.api_key_manager import APIKeyManager
-from images.utils import download_image
+from images.utils import download_first_images
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 
-async def fetch_images_from_serper(
-    queries: List[str],
+async def fetch_serper_image_bytes(
+    query: str,
     num_images: int,
     api_key_manager: APIKeyManager,
     httpx_client: httpx.AsyncClient
-) -> Tuple[List[File], List[str]]:
+) -> Tuple[List[bytes], List[str]]:
     """
-    Fetches images using the Serper image search API. This is used as a fallback
-    if the main image search via SearxNG fails.
+    Fetches images for a single query using the Serper image search API.
 
     Args:
-        queries: List of search queries.
-        num_images: Number of images to attempt to fetch per query.
+        query: Search query.
+        num_images: Number of images to attempt to fetch.
         api_key_manager: Instance managing API keys.
         httpx_client: HTTP client for making requests.
 
     Returns:
-        - A list of Discord File objects for the successfully downloaded images.
+        - A list of raw image bytes for the successfully downloaded images.
         - A list of URLs for which image downloading failed.
     """
-    image_files: List[File] = []
+    images: List[bytes] = []
     image_urls: List[str] = []
 
-    for query in queries:
-        logger.info(f"Fetching images from Serper for query: '{query}'")
-        
-        # Get API key
-        api_key: Optional[str] = await api_key_manager.get_next_api_key('serper')
-        if not api_key:
+    logger.info(f"Fetching images from Serper for query: '{query}'")
+
+    # Get API key
+    api_key: Optional[str] = await api_key_manager.get_next_api_key('serper')
+    if not api_key:
+        logger.warning(
+            f"No Serper API key available for image query: '{query}'"
+        )
+        return images, image_urls
+
+    # Prepare request
+    params: Dict[str, Any] = {
+        'q': query,
+        'num': num_images * 2,  # Request more to account for failures
+        'type': 'images',
+        'autocorrect': 'false',
+        'apiKey': api_key
+    }
+
+    try:
+        # Make API request
+        logger.debug(f"Making Serper images API request for query: '{query}'")
+        response: httpx.Response = await httpx_client.get(
+            'https://google.serper.dev/images',
+            params=params,
+            timeout=30.0
+        )
+        response.raise_for_status()
+        data: Dict[str, Any] = _json_loads(response.content)
+
+        # Collect candidate image URLs in ranked order
+        candidates: List[Tuple[str, Optional[str]]] = []
+
+        for image in data.get('images', [])[:num_images * 2]:
+            image_url: Optional[str] = image.get('imageUrl')
+            source_url: Optional[str] = image.get('sourceUrl')
+
+            if image_url:
+                candidates.append((image_url, source_url))
+
+        if not candidates:
             logger.warning(
-                f"No Serper API key available for image query: '{query}'"
-            )
-            continue
-
-        # Prepare request
-        params: Dict[str, Any] = {
-            'q': query,
-            'num': num_images * 2,  # Request more to account for failures
-            'type': 'images',
-            'autocorrect': 'false',
-            'apiKey': api_key
-        }
-
-        try:
-            # Make API request
-            logger.debug(f"Making Serper images API request for query: '{query}'")
-            response: httpx.Response = await httpx_client.get(
-                'https://google.serper.dev/images',
-                params=params,
-                timeout=30.0
+                f"No valid image URLs found in Serper results for query: "
+                f"'{query}'"
             )
-            response.raise_for_status()
-            data: Dict[str, Any] = response.json()
-
-            # Create a lookup dictionary of source URLs to image URLs
-            source_urls: Dict[str, str] = {}
-            for image in data.get('images', []):
-                source_urls[image.get('sourceUrl')] = image.get('imageUrl')
-
-            # Queue image download tasks
-            image_tasks: List[asyncio.Task] = []
-            urls_to_try: List[str] = []
-
-            for image in data.get('images', [])[:num_images * 2]:
-                image_url: Optional[str] = image.get('imageUrl')
-                source_url: Optional[str] = image.get('sourceUrl')
-
-                if image_url:
-                    urls_to_try.append(image_url)
-                    image_tasks.append(
-                        download_image(image_url, httpx_client, source_url)
-                    )
-
-            if not image_tasks:
-                logger.warning(
-                    f"No valid image URLs found in Serper results for query: "
-                    f"'{query}'"
-                )
-                continue
-
-            # Download images
-            logger.info(f"Downloading {len(image_tasks)} images for query: '{query}'")
-            downloaded_images: List[Optional[bytes]] = await asyncio.gather(*image_tasks)
-
-            # Process downloaded images
-            successful_downloads: int = 0
-            for idx, image_data in enumerate(downloaded_images):
-                if image_data is None:
-                    logger.error(
-                        f"Failed to download image from URL: {urls_to_try[idx]}"
-                    )
-                    if successful_downloads < num_images:
-                        image_urls.append(urls_to_try[idx])
-                else:
-                    if successful_downloads < num_images:
-                        image_file: File = File(
-                            BytesIO(image_data), 
-                            filename=f"image_{len(image_files) + 1}.png"
-                        )
-                        image_files.append(image_file)
-                        successful_downloads += 1
-
-                if successful_downloads >= num_images:
-                    break
-
-            logger.info(
-                f"Successfully downloaded {successful_downloads} images for "
-                f"query: '{query}'"
-            )
-
-        except httpx.HTTPError as http_err:
-            logger.error(
-                f"HTTP error while fetching images for query '{query}': "
-                f"{http_err}", 
-                exc_info=True
-            )
-            continue
-        except Exception as e:
-            logger.error(
-                f"Error fetching images for query '{query}': {e}", 
-                exc_info=True
-            )
-            continue
-
-    logger.info(
-        f"Completed Serper image fetching: {len(image_files)} files, "
-        f"{len(image_urls)} failed URLs"
-    )
-    return image_files, image_urls
\ No newline at end of file
+            return images, image_urls
+
+        # Download images
+        logger.info(f"Downloading {len(candidates)} images for query: '{query}'")
+        images, image_urls = await download_first_images(
+            candidates, num_images, httpx_client
+        )
+
+        logger.info(
+            f"Successfully downloaded {len(images)} images for "
+            f"query: '{query}'"
+        )
+
+    except httpx.HTTPError as http_err:
+        logger.error(
+            f"HTTP error while fetching images for query '{query}': "
+            f"{http_err}", 
+            exc_info=True
+        )
+    except Exception as e:
+        logger.error(
+            f"Error fetching images for query '{query}': {e}", 
+            exc_info=True
+        )
+
+    return images, image_urls
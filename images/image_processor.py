@@ -7,7 +7,7 @@ It provides functions to fetch images for search queries and update message view
 
 import asyncio
 import logging
-from typing import Dict, List, Optional
+from typing import Awaitable, Dict, List, Optional
 
 import httpx
 from discord import File, Message
@@ -132,31 +132,42 @@ async def _update_response_messages_with_image_views(
         image_files_dict: Dictionary of image files
         image_urls_dict: Dictionary of image URLs
     """
+    edited_msgs: List[Message] = []
+    edits: List[Awaitable[Message]] = []
+    # Every part of a response stores the same full text, so the parts
+    # normally share one view; views hold no per-message state
+    views: Dict[Optional[str], OutputView] = {}
     for response_msg in response_msgs:
         if response_msg.id in msg_nodes:
-            # Create a new view with image data
-            new_view = OutputView(
-                contents=msg_nodes[response_msg.id].text,
-                query=msg_nodes[user_msg_id].text,
-                serper_queries=split_queries,
-                image_files=image_files_dict,
-                image_urls=image_urls_dict
-            )
-            
-            try:
-                # Update the message with the new view
-                await response_msg.edit(view=new_view)
-                logger.debug(
-                    f"Updated message {response_msg.id} with image buttons"
-                )
-            except Exception as edit_error:
-                logger.error(
-                    f"Error updating message {response_msg.id} with images: "
-                    f"{edit_error}", 
-                    exc_info=True
+            contents = msg_nodes[response_msg.id].text
+            new_view = views.get(contents)
+            if new_view is None:
+                # Create a new view with image data
+                new_view = views[contents] = OutputView(
+                    contents=contents,
+                    query=msg_nodes[user_msg_id].text,
+                    serper_queries=split_queries,
+                    image_files=image_files_dict,
+                    image_urls=image_urls_dict
                 )
+            edited_msgs.append(response_msg)
+            edits.append(response_msg.edit(view=new_view))
         else:
             logger.warning(
                 f"Response message ID {response_msg.id} not found in msg_nodes "
                 f"when updating images"
-            )
\ No newline at end of file
+            )
+
+    # Update the messages with their new views concurrently
+    results = await asyncio.gather(*edits, return_exceptions=True)
+    for response_msg, result in zip(edited_msgs, results):
+        if isinstance(result, BaseException):
+            logger.error(
+                f"Error updating message {response_msg.id} with images: "
+                f"{result}", 
+                exc_info=result
+            )
+        else:
+            logger.debug(
+                f"Updated message {response_msg.id} with image buttons"
+            )
@@ -10,13 +10,73 @@ from typing import Dict, Any, List, Optional
 
 import httpx
 
+try:
+    # SauceNAO responses carry many results with metadata; orjson parses
+    # them straight from bytes when it is installed
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 from config.api_key_manager import APIKeyManager
+from images.utils import TTLCache
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 SAUCENAO_API_URL: str = "https://saucenao.com/search.php"
 
+# Repeat lookups of the same image are answered from these caches so they
+# don't spend SauceNAO quota or re-download the image
+SAUCENAO_RESULT_TTL_SECONDS: float = 3600.0
+SAUCENAO_IMAGE_TTL_SECONDS: float = 300.0
+SAUCENAO_CACHE_MAX_ENTRIES: int = 128
+SAUCENAO_IMAGE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+# Plain text layout of the response header and of each result
+SAUCENAO_HEADER_TEMPLATE: str = (
+    "SauceNAO Results:\n"
+    "Header:\n"
+    "  User ID: {user_id}\n"
+    "  Account Type: {account_type}\n"
+    "  Short Limit: {short_limit}\n"
+    "  Long Limit: {long_limit}\n"
+    "  Long Remaining: {long_remaining}\n"
+    "  Short Remaining: {short_remaining}\n"
+    "  Minimum Similarity: {minimum_similarity}\n"
+    "  Query Image: {query_image}\n"
+    "  Results Returned: {results_returned}\n"
+)
+SAUCENAO_RESULT_TEMPLATE: str = (
+    "Result:\n"
+    "  Similarity: {similarity}\n"
+    "  Thumbnail: {thumbnail}\n"
+    "  Index ID: {index_id}\n"
+    "  Index Name: {index_name}\n"
+)
+SAUCENAO_NO_MATCHES_TEXT: str = "No results above similarity threshold.\n"
+
+
+class _BlankDict(dict):
+    """
+    Dict for str.format_map that renders missing fields as empty strings.
+    """
+
+    def __missing__(self, key: str) -> str:
+        return ''
+
+
+# (image URL, min_similarity) -> formatted results
+_result_cache: TTLCache[str] = TTLCache(
+    SAUCENAO_RESULT_TTL_SECONDS, SAUCENAO_CACHE_MAX_ENTRIES
+)
+# Image URL -> downloaded image bytes
+_image_data_cache: TTLCache[bytes] = TTLCache(
+    SAUCENAO_IMAGE_TTL_SECONDS,
+    SAUCENAO_CACHE_MAX_ENTRIES,
+    SAUCENAO_IMAGE_CACHE_MAX_BYTES,
+    len
+)
+
 
 async def handle_saucenao_query(
     image_url: str,
@@ -41,6 +101,11 @@ async def handle_saucenao_query(
     """
     logger.info(f"Starting SauceNAO image source lookup for image: {image_url}")
     
+    cache_key = (image_url, min_similarity)
+    if (cached := _result_cache.get(cache_key)) is not None:
+        logger.info(f"Using cached SauceNAO results for image: {image_url}")
+        return cached
+    
     # Get API key
     api_key = await api_key_manager.get_next_api_key('saucenao')
     if not api_key:
@@ -49,12 +114,15 @@ async def handle_saucenao_query(
         raise Exception(error_msg)
 
     try:
-        # Download the image
-        logger.debug(f"Downloading image from URL: {image_url}")
-        image_response = await httpx_client.get(image_url)
-        image_response.raise_for_status()
-        image_data = image_response.content
-        logger.debug(f"Successfully downloaded image ({len(image_data)} bytes)")
+        # Download the image, reusing a recent download of the same URL
+        image_data = _image_data_cache.get(image_url)
+        if image_data is None:
+            logger.debug(f"Downloading image from URL: {image_url}")
+            image_response = await httpx_client.get(image_url)
+            image_response.raise_for_status()
+            image_data = image_response.content
+            _image_data_cache.put(image_url, image_data)
+            logger.debug(f"Successfully downloaded image ({len(image_data)} bytes)")
 
         # Prepare multipart form data
         files: Dict[str, tuple] = {
@@ -79,10 +147,12 @@ async def handle_saucenao_query(
             timeout=30.0
         )
         response.raise_for_status()
-        data: Dict[str, Any] = response.json()
+        data: Dict[str, Any] = _json_loads(response.content)
 
         # Format response as plain text
-        return _format_saucenao_response(data, min_similarity)
+        formatted = _format_saucenao_response(data, min_similarity)
+        _result_cache.put(cache_key, formatted)
+        return formatted
 
     except httpx.HTTPError as http_err:
         logger.error(
@@ -112,22 +182,8 @@ def _format_saucenao_response(
     Returns:
         Formatted plain text response
     """
-    lines: List[str] = []
     header: Dict[str, Any] = data.get('header', {})
-    
-    # Add header information
-    lines.append("SauceNAO Results:")
-    lines.append("Header:")
-    lines.append(f"  User ID: {header.get('user_id', '')}")
-    lines.append(f"  Account Type: {header.get('account_type', '')}")
-    lines.append(f"  Short Limit: {header.get('short_limit', '')}")
-    lines.append(f"  Long Limit: {header.get('long_limit', '')}")
-    lines.append(f"  Long Remaining: {header.get('long_remaining', '')}")
-    lines.append(f"  Short Remaining: {header.get('short_remaining', '')}")
-    lines.append(f"  Minimum Similarity: {header.get('minimum_similarity', '')}")
-    lines.append(f"  Query Image: {header.get('query_image', '')}")
-    lines.append(f"  Results Returned: {header.get('results_returned', '')}")
-    lines.append("")
+    parts: List[str] = [SAUCENAO_HEADER_TEMPLATE.format_map(_BlankDict(header))]
 
     # Log quota information
     logger.info(
@@ -136,41 +192,41 @@ def _format_saucenao_response(
         f"Long remaining: {header.get('long_remaining', 'N/A')}"
     )
 
-    # Process and filter results
-    results: List[Dict[str, Any]] = data.get('results', [])
-    filtered_results = []
-    for result in results:
-        similarity: float = float(
-            result.get('header', {}).get('similarity', 0)
-        )
+    # Filter and format results in a single pass
+    match_count: int = 0
+    for result in data.get('results', []):
+        rheader: Dict[str, str] = result.get('header') or {}
+        try:
+            similarity: float = float(rheader.get('similarity', 0))
+        except (TypeError, ValueError):
+            logger.debug(
+                "Skipping SauceNAO result with invalid similarity: %r",
+                rheader.get('similarity')
+            )
+            continue
         if similarity < min_similarity:
             continue
-        filtered_results.append(result)
-    
-    logger.info(
-        f"SauceNAO found {len(filtered_results)} results with similarity >= "
-        f"{min_similarity}%"
-    )
+        match_count += 1
 
-    # Add results to output
-    for result in filtered_results:
-        rheader: Dict[str, str] = result.get('header', {})
         rdata: Dict[str, Any] = result.get('data', {})
-        
-        lines.append("Result:")
-        lines.append(f"  Similarity: {rheader.get('similarity', '')}")
-        lines.append(f"  Thumbnail: {rheader.get('thumbnail', '')}")
-        lines.append(f"  Index ID: {rheader.get('index_id', '')}")
-        lines.append(f"  Index Name: {rheader.get('index_name', '')}")
-        
+        block: List[str] = [
+            SAUCENAO_RESULT_TEMPLATE.format_map(_BlankDict(rheader))
+        ]
         for key, value in rdata.items():
             if isinstance(value, list):
-                lines.append(f"  {key.capitalize()}:")
-                for item in value:
-                    lines.append(f"    - {item}")
+                items = "".join(f"    - {item}\n" for item in value)
+                block.append(f"  {key.capitalize()}:\n{items}")
             else:
-                lines.append(f"  {key.capitalize()}: {value}")
-        
-        lines.append("")
+                block.append(f"  {key.capitalize()}: {value}\n")
+        parts.append("".join(block))
+    
+    logger.info(
+        f"SauceNAO found {match_count} results with similarity >= "
+        f"{min_similarity}%"
+    )
+
+    if not match_count:
+        parts.append(SAUCENAO_NO_MATCHES_TEXT)
 
-    return "\n".join(lines)
\ No newline at end of file
+    # Blocks are separated by a blank line
+    return "\n".join(parts)
@@ -5,136 +5,138 @@ This module implements image search using SearxNG with a fallback to Serper.
 It defines helper functions to normalize, download and wrap image data as Discord Files.
 """
 
+import functools
 import logging
 import asyncio
 from typing import Any, Tuple, List, Dict, Optional
 
 import httpx
-from io import BytesIO
 from discord import File
 from urllib.parse import urljoin, quote
 
+try:
+    # Parse SearxNG result lists from bytes with orjson when available
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 from config.api_key_manager import APIKeyManager
 from config.searxng_config import get_searxng_config
-from images.image_handler import fetch_images_from_serper
-from images.utils import download_image
+from images.image_handler import fetch_serper_image_bytes
+from images.utils import TTLCache, download_first_images, image_files_from_bytes
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+# How long downloaded images for a query are reused, how many queries are
+# kept, and how many image bytes they may hold in total
+IMAGE_CACHE_TTL_SECONDS: float = 600.0
+IMAGE_CACHE_MAX_ENTRIES: int = 64
+IMAGE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+# (query, num_images) -> (image bytes, failed URLs). Raw bytes are cached
+# rather than Files, since a File's buffer is consumed when it is sent.
+_image_cache: TTLCache[Tuple[List[bytes], List[str]]] = TTLCache(
+    IMAGE_CACHE_TTL_SECONDS,
+    IMAGE_CACHE_MAX_ENTRIES,
+    IMAGE_CACHE_MAX_BYTES,
+    lambda result: sum(map(len, result[0]))
+)
+
 
-async def fetch_images_from_searxng(
+@functools.lru_cache(maxsize=1)
+def _searxng_images_request() -> Tuple[str, float]:
+    """
+    Build the SearxNG image search URL up to the query parameter.
+
+    Returns:
+        Tuple of (URL prefix ending in 'q=', request timeout)
+    """
+    searxng_config: Dict[str, Any] = get_searxng_config()
+    language: str = searxng_config['language'].split('#')[0].strip()
+
+    # Prepare the static request parameters
+    params: Dict[str, Any] = {
+        'format': 'json',
+        'language': language,
+        'safesearch': searxng_config['safe_search'],
+        'categories': 'images'
+    }
+
+    # Build URL with properly encoded parameters, leaving the query last
+    base_url: str = urljoin(searxng_config['base_url'], 'search')
+    param_strings: List[str] = [
+        f"{quote(str(key))}={quote(str(value))}"
+        for key, value in params.items()
+    ]
+    url_prefix: str = f"{base_url}?{'&'.join(param_strings)}&q="
+    return url_prefix, searxng_config['timeout']
+
+
+async def fetch_searxng_image_bytes(
     query: str,
     num_images: int,
-    api_key_manager: APIKeyManager,
     httpx_client: httpx.AsyncClient
-) -> Tuple[List[File], List[str]]:
+) -> Tuple[List[bytes], List[str]]:
     """
-    Search for images using SearxNG under the 'images' category.
+    Search for images using SearxNG and download them.
 
     Args:
         query: Search query.
         num_images: Number of desired images.
-        api_key_manager: API key manager instance.
         httpx_client: HTTP client.
 
     Returns:
         Tuple:
-          - List of Discord File objects (for successfully downloaded images).
+          - List of raw image bytes (for successfully downloaded images).
           - List of URLs for images that failed to download.
     """
-    image_files: List[File] = []
+    images: List[bytes] = []
     image_urls: List[str] = []
 
     try:
-        # Get SearxNG configuration
-        searxng_config: Dict[str, Any] = get_searxng_config()
-        language: str = searxng_config['language'].split('#')[0].strip()
-
-        # Prepare request parameters
-        params: Dict[str, Any] = {
-            'q': query,
-            'format': 'json',
-            'language': language,
-            'safesearch': searxng_config['safe_search'],
-            'categories': 'images'
-        }
-
-        # Build URL with properly encoded parameters
-        base_url: str = urljoin(searxng_config['base_url'], 'search')
-        param_strings: List[str] = []
-        for key, value in params.items():
-            encoded_key: str = quote(str(key))
-            encoded_value: str = quote(str(value))
-            param_strings.append(f"{encoded_key}={encoded_value}")
-        url: str = f"{base_url}?{'&'.join(param_strings)}"
+        # Only the query varies between requests
+        url_prefix, timeout = _searxng_images_request()
+        url: str = url_prefix + quote(query)
 
         logger.info(f"Making SearxNG images request to: {url}")
 
         # Send request to SearxNG
         response: httpx.Response = await httpx_client.get(
             url,
-            timeout=searxng_config['timeout']
+            timeout=timeout
         )
         response.raise_for_status()
 
         # Process response
-        data: Dict[str, Any] = response.json()
+        data: Dict[str, Any] = _json_loads(response.content)
         if not data.get('results'):
             logger.warning(f"No image results found from SearxNG for query: {query}")
             return [], []
 
-        # Queue image download tasks
-        image_tasks: List[asyncio.Task] = []
-        urls_to_try: List[str] = []
-
-        # Create mapping of source URLs to image URLs
-        source_urls: Dict[str, str] = {
-            result.get('source_url'): result.get('img_src') 
-            for result in data['results']
-        }
-
-        # Create download tasks for each image
-        for result in data['results'][:num_images * 2]:
-            if 'img_src' in result:
-                img_url: str = result['img_src']
-                source_url: str = result.get('source_url')
-                urls_to_try.append(img_url)
-                image_tasks.append(download_image(img_url, httpx_client, source_url))
-
-        if not image_tasks:
+        # Collect candidate image URLs in ranked order
+        candidates: List[Tuple[str, Optional[str]]] = [
+            (result['img_src'], result.get('source_url'))
+            for result in data['results'][:num_images * 2]
+            if 'img_src' in result
+        ]
+
+        if not candidates:
             logger.warning(
                 f"No valid image URLs found in SearxNG results for query: {query}"
             )
             return [], []
 
-        # Execute all download tasks concurrently
-        downloaded_images: List[Optional[bytes]] = await asyncio.gather(*image_tasks)
-
-        # Process downloaded images
-        successful_downloads: int = 0
-        for idx, image_data in enumerate(downloaded_images):
-            if image_data is None:
-                logger.error(f"Failed to download image from URL: {urls_to_try[idx]}")
-                if successful_downloads < num_images:
-                    image_urls.append(urls_to_try[idx])
-            else:
-                if successful_downloads < num_images:
-                    image_file: File = File(
-                        BytesIO(image_data), 
-                        filename=f"image_{len(image_files) + 1}.png"
-                    )
-                    image_files.append(image_file)
-                    successful_downloads += 1
-
-            if successful_downloads >= num_images:
-                break
+        # Download until enough images have succeeded
+        images, image_urls = await download_first_images(
+            candidates, num_images, httpx_client
+        )
 
         logger.info(
-            f"SearxNG returned {successful_downloads} images and "
+            f"SearxNG returned {len(images)} images and "
             f"{len(image_urls)} failed URLs for query: {query}"
         )
-        return image_files, image_urls
+        return images, image_urls
 
     except Exception as e:
         logger.error(
@@ -144,6 +146,72 @@ async def fetch_images_from_searxng(
         return [], []
 
 
+async def _fetch_query_images(
+    query: str,
+    num_images: int,
+    api_key_manager: APIKeyManager,
+    httpx_client: httpx.AsyncClient,
+    hedge_delay: float
+) -> Tuple[List[bytes], List[str]]:
+    """
+    Fetch images for one query from SearxNG, falling back to Serper if it
+    finds none. With a positive hedge delay, Serper is also started once
+    SearxNG has been running that long, and is cancelled if SearxNG
+    still comes back with images.
+
+    Args:
+        query: Search query.
+        num_images: Desired number of images.
+        api_key_manager: API key manager.
+        httpx_client: HTTP client.
+        hedge_delay: Seconds to wait on SearxNG before starting Serper
+            alongside it, or 0 to only use Serper as a fallback.
+
+    Returns:
+        Tuple:
+          - List of raw image bytes.
+          - List of URLs for images that failed to download.
+    """
+    searxng_task = asyncio.create_task(
+        fetch_searxng_image_bytes(query, num_images, httpx_client)
+    )
+    serper_task: Optional[asyncio.Task] = None
+    try:
+        if hedge_delay > 0:
+            done, _ = await asyncio.wait({searxng_task}, timeout=hedge_delay)
+            if not done:
+                logger.info(
+                    f"SearxNG image search for query '{query}' is slow. "
+                    f"Starting Serper alongside it."
+                )
+                serper_task = asyncio.create_task(
+                    fetch_serper_image_bytes(
+                        query, num_images, api_key_manager, httpx_client
+                    )
+                )
+
+        result: Tuple[List[bytes], List[str]] = await searxng_task
+        if any(result):
+            return result
+
+        logger.info(
+            f"SearxNG found no images for query '{query}'. "
+            f"Falling back to Serper."
+        )
+        if serper_task is None:
+            serper_task = asyncio.create_task(
+                fetch_serper_image_bytes(
+                    query, num_images, api_key_manager, httpx_client
+                )
+            )
+        return await serper_task
+    finally:
+        # Drop whichever search is no longer needed
+        for task in (searxng_task, serper_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+
 async def fetch_images(
     queries: List[str],
     num_images: int,
@@ -152,7 +220,8 @@ async def fetch_images(
 ) -> Tuple[Dict[str, List[File]], Dict[str, List[str]]]:
     """
     For a given list of queries, fetch images using SearxNG, and if necessary,
-    fall back to fetching from Serper.
+    fall back to fetching from Serper. Images for a query are reused for
+    IMAGE_CACHE_TTL_SECONDS.
 
     Args:
         queries: List of search queries.
@@ -167,46 +236,45 @@ async def fetch_images(
     """
     image_files_dict: Dict[str, List[File]] = {}
     image_urls_dict: Dict[str, List[str]] = {}
+    fetched: Dict[str, Tuple[List[bytes], List[str]]] = {}
 
+    # Serve repeated queries from the cache
+    pending_queries: List[str] = []
     for query in queries:
-        # Try SearxNG first
-        files: List[File]
-        urls: List[str]
-        files, urls = await fetch_images_from_searxng(
-            query, num_images, api_key_manager, httpx_client
-        )
-
-        # If SearxNG found no images, fall back to Serper
-        if not files and not urls:
-            logger.info(
-                f"SearxNG found no images for query '{query}'. "
-                f"Falling back to Serper."
-            )
-            fallback_files, fallback_urls = await fetch_images_from_serper(
-                [query], num_images, api_key_manager, httpx_client
-            )
-            
-            # Validate fallback results
-            if isinstance(fallback_files, list):
-                files = fallback_files
-            else:
-                logger.warning(
-                    f"Serper returned invalid files type for query '{query}': "
-                    f"{type(fallback_files)}"
+        cached = _image_cache.get((query, num_images))
+        if cached is not None:
+            logger.info(f"Using cached images for query '{query}'")
+            fetched[query] = cached
+        elif query not in pending_queries:
+            pending_queries.append(query)
+
+    # Search all remaining queries concurrently; each falls back to Serper
+    # on its own as soon as its SearxNG search comes back empty
+    hedge_delay: float = get_searxng_config()['image_hedge_delay']
+    async with asyncio.TaskGroup() as tg:
+        query_tasks: List[asyncio.Task] = [
+            tg.create_task(
+                _fetch_query_images(
+                    query, num_images, api_key_manager, httpx_client,
+                    hedge_delay
                 )
-                files = []
-                
-            if isinstance(fallback_urls, list):
-                urls = fallback_urls
-            else:
-                logger.warning(
-                    f"Serper returned invalid URLs type for query '{query}': "
-                    f"{type(fallback_urls)}"
-                )
-                urls = []
+            )
+            for query in pending_queries
+        ]
+
+    for query, query_task in zip(pending_queries, query_tasks):
+        fetched[query] = query_task.result()
 
-        # Store results for this query
-        image_files_dict[query] = files
+    for query in pending_queries:
+        images, urls = fetched[query]
+        # Only cache successful searches so transient failures are retried
+        if images:
+            _image_cache.put((query, num_images), (images, urls))
+
+    # Build fresh Files for each query, since they cannot be sent twice
+    for query in queries:
+        images, urls = fetched[query]
+        image_files_dict[query] = image_files_from_bytes(images)
         image_urls_dict[query] = urls
 
-    return image_files_dict, image_urls_dict
\ No newline at end of file
+    return image_files_dict, image_urls_dict
@@ -4,17 +4,270 @@ Image Utilities Module
 Provides helper functions for image URL normalization and downloading.
 """
 
+import asyncio
+import functools
 import logging
 import base64
-from typing import Optional
+import re
+import time
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, List, Optional, Set, Tuple, TypeVar
 from urllib.parse import urljoin, urlparse
 
 import httpx
+from discord import File
 from fake_useragent import UserAgent
+from io import BytesIO
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+T = TypeVar("T")
+
+# Cap on simultaneous image downloads across all searches, so parallel
+# queries queue here instead of exhausting the HTTP client's connection pool
+MAX_CONCURRENT_IMAGE_DOWNLOADS: int = 32
+_image_download_semaphore = asyncio.Semaphore(MAX_CONCURRENT_IMAGE_DOWNLOADS)
+
+# Cap on simultaneous image downloads from any one host, so a single slow
+# CDN cannot take every download slot. Entries disappear once no download
+# holds or waits on them.
+MAX_CONCURRENT_DOWNLOADS_PER_HOST: int = 6
+_host_download_semaphores: "weakref.WeakValueDictionary[str, asyncio.Semaphore]" = (
+    weakref.WeakValueDictionary()
+)
+
+# Content types accepted as image data
+VALID_IMAGE_CONTENT_TYPES = re.compile(
+    r'image/|application/octet-stream|binary/|multipart/form-data'
+)
+
+# Domains whose images are accepted regardless of content type
+SPECIAL_CASE_IMAGE_DOMAINS = re.compile(r'facebook|fbcdn|fbsbx|pinterest|pinimg')
+
+# Number of normalized image URLs remembered
+NORMALIZED_URL_CACHE_SIZE: int = 8192
+
+# Bounds for the cache of validators used for conditional image requests
+ETAG_CACHE_MAX_ENTRIES: int = 256
+ETAG_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+# Normalized image URL -> (download task, number of searches waiting on
+# it), so concurrent searches finding the same image download it once
+_inflight_downloads: Dict[str, Tuple[asyncio.Task, int]] = {}
+
+# Leading bytes of the image formats Discord previews, mapped to their
+# file extension
+IMAGE_SIGNATURES: Tuple[Tuple[bytes, str], ...] = (
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+)
+
+
+class TTLCache(Generic[T]):
+    """
+    Small LRU cache whose entries expire a fixed time after being stored,
+    optionally also bounded by the total size of its values.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[T], int]] = None
+    ) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            ttl: Seconds an entry stays valid
+            max_entries: Maximum number of entries kept
+            max_bytes: Maximum total size of the values kept, or None for
+                no size limit
+            sizeof: Function giving a value's size in bytes; required when
+                max_bytes is set
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, Tuple[float, T, int]]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: Hashable) -> Optional[T]:
+        """
+        Look up an entry, dropping it if it has expired.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, size = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._bytes -= size
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: T) -> None:
+        """
+        Store an entry, evicting the least recently used ones.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[2]
+        size = self._sizeof(value) if self._sizeof is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value, size)
+        self._bytes += size
+        while (len(self._entries) > self.max_entries
+               or (self.max_bytes is not None
+                   and self._bytes > self.max_bytes)):
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+
+class _ETagCache:
+    """
+    LRU cache of downloaded images and their ETags, bounded by entry count
+    and total bytes stored.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of cached images
+            max_bytes: Maximum total bytes across cached images
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, url: str) -> Optional[Tuple[str, bytes]]:
+        """
+        Look up a cached image and mark it as recently used.
+
+        Args:
+            url: Normalized image URL
+
+        Returns:
+            Tuple of (ETag, image data) or None
+        """
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+        return entry
+
+    def put(self, url: str, etag: str, image_data: bytes) -> None:
+        """
+        Store an image with its ETag, evicting least recently used entries.
+
+        Args:
+            url: Normalized image URL
+            etag: ETag the server sent with the image
+            image_data: Downloaded image data
+        """
+        if len(image_data) > self.max_bytes:
+            return
+        if url in self._entries:
+            self._bytes -= len(self._entries.pop(url)[1])
+        self._entries[url] = (etag, image_data)
+        self._bytes += len(image_data)
+        while (len(self._entries) > self.max_entries
+               or self._bytes > self.max_bytes):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+
+_etag_cache = _ETagCache(ETAG_CACHE_MAX_ENTRIES, ETAG_CACHE_MAX_BYTES)
+
+
+@functools.lru_cache(maxsize=1)
+def _user_agent() -> UserAgent:
+    """
+    Get the shared fake-useragent generator, loading its browser data on
+    first use.
+
+    Returns:
+        The UserAgent instance
+    """
+    return UserAgent()
+
+
+def _host_download_semaphore(url: str) -> asyncio.Semaphore:
+    """
+    Get the semaphore limiting concurrent downloads from a URL's host.
+
+    Args:
+        url: Normalized image URL
+
+    Returns:
+        The host's semaphore
+    """
+    host = urlparse(url).netloc
+    semaphore = _host_download_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS_PER_HOST)
+        _host_download_semaphores[host] = semaphore
+    return semaphore
+
+
+def guess_image_extension(image_data: bytes) -> str:
+    """
+    Guess an image's file extension from its leading bytes.
+
+    Args:
+        image_data: Downloaded image data.
+
+    Returns:
+        The file extension, defaulting to 'png' for unrecognized data.
+    """
+    for signature, extension in IMAGE_SIGNATURES:
+        if image_data.startswith(signature):
+            return extension
+    if image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
+        return 'webp'
+    return 'png'
+
+
+def image_files_from_bytes(images: List[bytes], start: int = 1) -> List[File]:
+    """
+    Wrap downloaded image bytes as numbered Discord File objects, named
+    with the extension of their actual format. The BytesIO wrappers share
+    the downloaded buffers rather than copying them.
+
+    Args:
+        images: Downloaded image bytes.
+        start: Number given to the first file.
+
+    Returns:
+        List of Discord File objects.
+    """
+    return [
+        File(
+            BytesIO(image_data),
+            filename=f"image_{idx}.{guess_image_extension(image_data)}"
+        )
+        for idx, image_data in enumerate(images, start=start)
+    ]
+
 
 def normalize_image_url(image_url: str, base_url: Optional[str] = None) -> Optional[str]:
     """
@@ -27,15 +280,35 @@ def normalize_image_url(image_url: str, base_url: Optional[str] = None) -> Optio
     Returns:
         A normalized image URL or None if unable to resolve.
     """
-    try:
-        if not image_url:
-            logger.warning("Empty image URL provided")
-            return None
-            
-        if image_url.startswith('data:'):
-            logger.debug("Data URL detected, returning as-is")
-            return image_url
+    if not image_url:
+        logger.warning("Empty image URL provided")
+        return None
+        
+    # Data URLs can be large, so they are returned before reaching the cache
+    if image_url.startswith('data:'):
+        logger.debug("Data URL detected, returning as-is")
+        return image_url
+
+    return _normalize_http_image_url(image_url, base_url)
+
+
+@functools.lru_cache(maxsize=NORMALIZED_URL_CACHE_SIZE)
+def _normalize_http_image_url(
+    image_url: str,
+    base_url: Optional[str]
+) -> Optional[str]:
+    """
+    Normalize a non-data image URL. Results are cached, since the same
+    image URLs recur across searches and queries.
+
+    Args:
+        image_url: The raw image URL.
+        base_url: Base URL to resolve relative URLs.
 
+    Returns:
+        A normalized image URL or None if unable to resolve.
+    """
+    try:
         image_url = image_url.strip()
         logger.debug(f"Normalizing image URL: {image_url}")
 
@@ -123,8 +396,7 @@ async def download_image(
             return data.encode('utf-8')
 
         # Use fake-useragent to generate a random user agent
-        ua = UserAgent()
-        random_user_agent = ua.random
+        random_user_agent = _user_agent().random
         
         # Set common headers for image requests with random user agent
         headers = {
@@ -134,37 +406,46 @@ async def download_image(
         
         logger.debug(f"Using random user agent: {random_user_agent}")
         
-        # Handle HTTP URLs with explicit redirect handling
+        # Revalidate a previously downloaded copy instead of refetching it
+        cached = _etag_cache.get(normalized_url)
+        if cached is not None:
+            headers['If-None-Match'] = cached[0]
+        
+        # Handle HTTP URLs; httpx follows redirects up to its own limit
         logger.debug(f"Downloading image from URL: {normalized_url}")
-        response: httpx.Response = await httpx_client.get(
-            normalized_url, 
-            timeout=10.0,
-            follow_redirects=True,  # Enable following redirects
-            headers=headers
-        )
+        # Wait for a host slot before taking one of the shared slots
+        async with _host_download_semaphore(normalized_url), _image_download_semaphore:
+            response: httpx.Response = await httpx_client.get(
+                normalized_url, 
+                timeout=10.0,
+                follow_redirects=True,  # Enable following redirects
+                headers=headers
+            )
+
+        if response.status_code == 304 and cached is not None:
+            logger.debug(f"Image not modified, reusing cached copy: {normalized_url}")
+            return cached[1]
         response.raise_for_status()
 
         # Get content type, defaulting to empty string if not present
         content_type: str = response.headers.get('content-type', '').lower()
         
-        # List of acceptable image content types
-        valid_image_types = [
-            'image/', 
-            'application/octet-stream',
-            'binary/',
-            'multipart/form-data'
-        ]
-        
         # Check if content type is valid for images
-        is_valid_type = any(type_str in content_type for type_str in valid_image_types)
+        is_valid_type = VALID_IMAGE_CONTENT_TYPES.search(content_type) is not None
         
-        # Special case handling for known problematic domains
-        special_case_domains = ['facebook', 'fbcdn', 'fbsbx', 'pinterest', 'pinimg']
-        is_special_domain = any(domain in normalized_url for domain in special_case_domains)
+        # Special case handling for known problematic domains, which often
+        # serve images with a misleading content type
+        is_special_domain = (
+            not is_valid_type
+            and SPECIAL_CASE_IMAGE_DOMAINS.search(normalized_url) is not None
+        )
         
         # Process content if valid type or special case with reasonable size (> 1KB)
         if is_valid_type or (is_special_domain and len(response.content) > 1000):
             logger.debug(f"Successfully downloaded image ({len(response.content)} bytes)")
+            etag: Optional[str] = response.headers.get('etag')
+            if etag:
+                _etag_cache.put(normalized_url, etag, response.content)
             return response.content
         
         # If we get here, content doesn't meet image criteria
@@ -172,23 +453,6 @@ async def download_image(
         return None
 
     except httpx.HTTPError as http_err:
-        # Handle redirect errors specifically
-        if '301' in str(http_err) or '302' in str(http_err) or 'redirect' in str(http_err).lower():
-            logger.warning(f"Redirect error for URL {image_url}")
-            
-            # Try to extract the redirect location
-            redirect_location = None
-            if hasattr(http_err, 'response') and 'location' in http_err.response.headers:
-                redirect_location = http_err.response.headers['location']
-                logger.info(f"Redirect location: {redirect_location}")
-                
-                # Try to follow the redirect manually as last resort
-                try:
-                    logger.debug(f"Attempting to follow redirect manually to: {redirect_location}")
-                    return await download_image(redirect_location, httpx_client, base_url)
-                except Exception as redirect_err:
-                    logger.error(f"Error following redirect manually: {redirect_err}")
-                    
         logger.error(f"HTTP error downloading image from {image_url}: {http_err}")
         return None
     except ValueError as ve:
@@ -196,4 +460,149 @@ async def download_image(
         return None
     except Exception as e:
         logger.error(f"Error downloading image from {image_url}: {e}", exc_info=True)
-        return None
\ No newline at end of file
+        return None
+
+
+def _download_key(candidate: Tuple[str, Optional[str]]) -> str:
+    """
+    Key an image candidate by the URL it will actually be downloaded from.
+
+    Args:
+        candidate: Tuple of (image URL, base URL)
+
+    Returns:
+        The normalized URL, or the raw URL if it cannot be normalized
+    """
+    image_url, base_url = candidate
+    return normalize_image_url(image_url, base_url) or image_url
+
+
+def _join_download(
+    key: str,
+    candidate: Tuple[str, Optional[str]],
+    httpx_client: httpx.AsyncClient
+) -> asyncio.Task:
+    """
+    Get the in-flight download for an image, starting it if needed, and
+    register one more search waiting on it.
+
+    Args:
+        key: Normalized image URL
+        candidate: Tuple of (image URL, base URL) to download if needed
+        httpx_client: HTTP client to make requests
+
+    Returns:
+        The shared download task
+    """
+    task, waiters = _inflight_downloads.get(key, (None, 0))
+    if task is None:
+        image_url, base_url = candidate
+        task = asyncio.create_task(
+            download_image(image_url, httpx_client, base_url)
+        )
+        task.add_done_callback(functools.partial(_forget_download, key))
+    _inflight_downloads[key] = (task, waiters + 1)
+    return task
+
+
+def _forget_download(key: str, task: asyncio.Task) -> None:
+    """
+    Remove a finished download from the in-flight map.
+
+    Args:
+        key: Normalized image URL
+        task: The finished download task
+    """
+    entry = _inflight_downloads.get(key)
+    if entry is not None and entry[0] is task:
+        del _inflight_downloads[key]
+
+
+def _leave_download(key: str, task: asyncio.Task) -> bool:
+    """
+    Unregister a search that no longer needs a download, cancelling the
+    download if no other search is waiting on it.
+
+    Args:
+        key: Normalized image URL
+        task: The shared download task
+
+    Returns:
+        True if the download was cancelled
+    """
+    entry = _inflight_downloads.get(key)
+    if entry is None or entry[0] is not task:
+        return False
+    if entry[1] <= 1:
+        # Unregister first so a new search starts its own download
+        # instead of joining one that is being cancelled
+        del _inflight_downloads[key]
+        task.cancel()
+        return True
+    _inflight_downloads[key] = (task, entry[1] - 1)
+    return False
+
+
+async def download_first_images(
+    candidates: List[Tuple[str, Optional[str]]],
+    num_images: int,
+    httpx_client: httpx.AsyncClient
+) -> Tuple[List[bytes], List[str]]:
+    """
+    Download candidate images concurrently, stopping as soon as enough
+    have succeeded and cancelling the downloads still in flight. A URL that
+    another search is already downloading is shared rather than fetched
+    again, and candidates that normalize to the same URL are only
+    downloaded once.
+
+    Args:
+        candidates: Ranked list of (image URL, base URL) pairs.
+        num_images: Number of images wanted.
+        httpx_client: HTTP client to make requests.
+
+    Returns:
+        Tuple:
+          - Downloaded image data, in the candidates' ranked order.
+          - URLs of the images that failed to download.
+    """
+    # Drop repeated candidates, keeping the best-ranked occurrence
+    unique_candidates: Dict[str, Tuple[str, Optional[str]]] = {}
+    for candidate in candidates:
+        unique_candidates.setdefault(_download_key(candidate), candidate)
+    keys: List[str] = list(unique_candidates)
+
+    tasks: Dict[asyncio.Task, int] = {
+        _join_download(key, unique_candidates[key], httpx_client): idx
+        for idx, key in enumerate(keys)
+    }
+    downloaded: Dict[int, bytes] = {}
+    failed_urls: List[str] = []
+
+    pending: Set[asyncio.Task] = set(tasks)
+    try:
+        while pending and len(downloaded) < num_images:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                image_url = unique_candidates[keys[tasks[task]]][0]
+                image_data: Optional[bytes] = (
+                    None if task.cancelled() else task.result()
+                )
+                if image_data is None:
+                    logger.error(f"Failed to download image from URL: {image_url}")
+                    failed_urls.append(image_url)
+                else:
+                    downloaded[tasks[task]] = image_data
+    finally:
+        # Drop the slower downloads once enough images are in hand, unless
+        # another search is still waiting on them
+        cancelled: List[asyncio.Task] = [
+            task for task in pending
+            if _leave_download(keys[tasks[task]], task)
+        ]
+        if cancelled:
+            await asyncio.wait(cancelled)
+
+    images = [downloaded[idx] for idx in sorted(downloaded)][:num_images]
+    return images, failed_urls
@@ -113,11 +113,20 @@ class LLMService:
     @staticmethod
     async def log_request_payload(payload: Dict[str, Any]) -> None:
         """
-        Log the request payload, redacting sensitive information.
+        Log the request payload at debug level, redacting sensitive
+        information.
         
         Args:
             payload: Request payload dictionary
         """
+        # Log base_url if present
+        if "base_url" in payload:
+            logger.info(f"Using base_url: {payload['base_url']}")
+        
+        # Skip copying and serializing the payload if it won't be logged
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        
         # Create a deep copy for logging to avoid modifying the original
         logging_payload = json.loads(json.dumps(payload, default=str))
         
@@ -144,11 +153,7 @@ class LLMService:
                                     prefix + data[:10] + "..." + data[-10:]
                                 )
         
-        # Log base_url if present
-        if "base_url" in logging_payload:
-            logger.info(f"Using base_url: {logging_payload['base_url']}")
-            
-        logger.info(
+        logger.debug(
             f"Payload being sent to LLM API:\n"
             f"{json.dumps(logging_payload, indent=2)}"
         )
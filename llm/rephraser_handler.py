@@ -458,6 +458,10 @@ def _log_rephraser_request(
         rephraser_provider: Provider name
         rephraser_model: Model name
     """
+    # Skip copying and serializing the request if it won't be logged
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    
     # Create a copy for logging
     logging_kwargs = json.loads(json.dumps(kwargs, default=str))
     
@@ -5,8 +5,9 @@ Delegates search queries to the SearchService and then wraps the results
 (and any errors) in a structured plain text format.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 import httpx
 
@@ -18,11 +19,37 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
+async def search_query(
+    query: str,
+    api_key_manager: APIKeyManager,
+    httpx_client: httpx.AsyncClient,
+    config: Optional[Dict[str, Any]] = None
+) -> Tuple[List[SearchResult], List[str]]:
+    """
+    Search the providers for a single query without fetching page content.
+    A task running this can be handed to handle_search_queries so that the
+    query is not searched twice.
+
+    Args:
+        query: Search query.
+        api_key_manager: API key manager instance.
+        httpx_client: HTTP client for web requests.
+        config: Additional configuration options.
+
+    Returns:
+        Tuple of (search results, errors) as returned by SearchService.search.
+    """
+    config = config or {}
+    search_service = SearchService(api_key_manager, httpx_client)
+    return await search_service.search(query, config.get("max_urls", 5))
+
+
 async def handle_search_queries(
     queries: List[str],
     api_key_manager: APIKeyManager,
     httpx_client: httpx.AsyncClient,
-    config: Optional[Dict[str, Any]] = None
+    config: Optional[Dict[str, Any]] = None,
+    pending_searches: Optional[Dict[str, asyncio.Task]] = None
 ) -> str:
     """
     Perform a search on multiple queries, gather all results,
@@ -34,12 +61,15 @@ async def handle_search_queries(
         api_key_manager: API key manager instance.
         httpx_client: HTTP client for web requests.
         config: Additional configuration options.
+        pending_searches: Already started search_query tasks by query,
+            used instead of searching those queries again.
 
     Returns:
         A plain text string containing aggregated search results.
     """
     config = config or {}
     max_urls = config.get("max_urls", 5)
+    pending_searches = pending_searches or {}
     
     logger.info(f"Handling search for {len(queries)} queries with max_urls={max_urls}")
     
@@ -48,12 +78,25 @@ async def handle_search_queries(
     aggregated_results: Dict[str, SearchResult] = {}
     errors: List[str] = []
 
-    # Perform search for each query
-    for i, query in enumerate(queries, 1):
-        logger.info(f"Searching for query {i}/{len(queries)}: '{query}'")
-        
-        # Get search results
-        results, error = await search_service.search(query, max_urls)
+    # Run the searches for all queries concurrently
+    async with asyncio.TaskGroup() as tg:
+        search_tasks: List[asyncio.Task] = []
+        for i, query in enumerate(queries, 1):
+            if query in pending_searches:
+                logger.info(
+                    f"Reusing started search for query {i}/{len(queries)}: "
+                    f"'{query}'"
+                )
+                search_tasks.append(pending_searches[query])
+                continue
+            logger.info(f"Searching for query {i}/{len(queries)}: '{query}'")
+            search_tasks.append(
+                tg.create_task(search_service.search(query, max_urls))
+            )
+
+    # Collect results in query order; started searches may still be running
+    for query, search_task in zip(queries, search_tasks):
+        results, error = await search_task
         
         if error:
             logger.warning(f"Error during search for query '{query}': {error}")
@@ -13,6 +13,7 @@ import asyncio
 import logging
 import re
 from typing import Dict, Any, List, Optional
+from urllib.parse import urlsplit
 
 import httpx
 from bs4 import BeautifulSoup, Comment
@@ -26,6 +27,56 @@ from providers.reddit_handler import fetch_reddit_content
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Registered domains with dedicated content handlers (subdomains included)
+URL_HOST_KINDS: Dict[str, str] = {
+    'youtube.com': 'youtube',
+    'youtu.be': 'youtube',
+    'reddit.com': 'reddit',
+    'redd.it': 'reddit',
+}
+
+# Pattern used to find URLs in message text
+URL_PATTERN = re.compile(r'(https?://\S+)')
+
+# Elements dropped from fetched HTML before extracting its text
+NON_CONTENT_TAGS: List[str] = [
+    'script', 'style', 'header', 'footer', 'nav', 'aside', 'form', 'svg',
+    'canvas',
+]
+
+# Most of a fetched HTML or text page that is read; extracted text is cut to
+# 20,000 characters anyway, so huge pages need not be held in memory in full
+MAX_PAGE_BYTES: int = 2 * 1024 * 1024
+
+
+def _is_comment(text: Any) -> bool:
+    """Return whether a BeautifulSoup string node is an HTML comment."""
+    return isinstance(text, Comment)
+
+
+def classify_url(url: str) -> str:
+    """
+    Classify a URL by its hostname.
+
+    Args:
+        url: The URL to classify.
+
+    Returns:
+        'youtube', 'reddit', or 'web' for any other host.
+    """
+    try:
+        host = urlsplit(url).hostname or ''
+    except ValueError:
+        return 'web'
+
+    # Check the host and each parent domain, e.g. old.reddit.com, reddit.com
+    labels = host.split('.')
+    for i in range(len(labels) - 1):
+        kind = URL_HOST_KINDS.get('.'.join(labels[i:]))
+        if kind:
+            return kind
+    return 'web'
+
 
 def extract_urls_from_text(text: str) -> List[str]:
     """
@@ -37,9 +88,7 @@ def extract_urls_from_text(text: str) -> List[str]:
     Returns:
         A list of URLs found.
     """
-    url_pattern = re.compile(r'(https?://\S+)')
-    urls = re.findall(url_pattern, text)
-    return urls
+    return URL_PATTERN.findall(text)
 
 
 def parse_html_content(html_content: str) -> str:
@@ -58,11 +107,11 @@ def parse_html_content(html_content: str) -> str:
         soup = BeautifulSoup(html_content, 'lxml')
         
         # Remove script, style, and other non-content elements
-        for tag in soup(['script', 'style', 'header', 'footer', 'nav', 'aside', 'form', 'svg', 'canvas']):
+        for tag in soup(NON_CONTENT_TAGS):
             tag.decompose()
             
         # Remove comments
-        for comment in soup.find_all(text=lambda text: isinstance(text, Comment)):
+        for comment in soup.find_all(string=_is_comment):
             comment.extract()
             
         # Extract text
@@ -86,11 +135,17 @@ def parse_pdf_content(pdf_bytes: bytes) -> str:
     """
     try:
         reader = PdfReader(BytesIO(pdf_bytes))
-        text_content = ''
+        page_texts: List[str] = []
+        total_length = 0
         for page in reader.pages:
             text = page.extract_text()
             if text:
-                text_content += text + '\n'
+                page_texts.append(text + '\n')
+                total_length += len(text) + 1
+                # Later pages would be cut off by the truncation below
+                if total_length >= 20000:
+                    break
+        text_content = ''.join(page_texts)
         if not text_content:
             text_content = "No extractable text found in PDF."
         return text_content[:20000]
@@ -117,11 +172,12 @@ async def fetch_single_url_content(
         Plain text content string, truncated to 20,000 characters.
     """
     # Handle special URL types
-    if 'youtube.com' in url or 'youtu.be' in url:
+    url_kind = classify_url(url)
+    if url_kind == 'youtube':
         content = await fetch_youtube_content(url, api_key_manager, httpx_client)
         # Return content without the prefix for YouTube URLs
         return content[:20000]  # Modified to remove "YouTube Content:" prefix
-    elif 'reddit.com' in url or 'redd.it' in url:
+    elif url_kind == 'reddit':
         content = await fetch_reddit_content(url, api_key_manager, httpx_client)
         # Return content without the prefix for Reddit URLs
         return content[:20000]  # Modified to remove "Reddit Content:" prefix
@@ -143,24 +199,40 @@ async def fetch_single_url_content(
     # Fallback to direct fetch
     try:
         logger.debug(f"Fetching URL directly: {url}")
-        response = await httpx_client.get(url, timeout=10.0, follow_redirects=True)
-        response.raise_for_status()
-        content_type = response.headers.get('Content-Type', '')
+        async with httpx_client.stream(
+            "GET", url, timeout=10.0, follow_redirects=True
+        ) as response:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+
+            # PDFs can only be parsed whole
+            if 'application/pdf' in content_type:
+                logger.debug(f"Processing PDF content from {url}")
+                pdf_bytes = await response.aread()
+                text_content = await asyncio.to_thread(parse_pdf_content, pdf_bytes)
+                return f"PDF Content (fallback):\n{text_content}"
+            
+            # Read pages only up to MAX_PAGE_BYTES
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) >= MAX_PAGE_BYTES:
+                    logger.debug(
+                        f"Stopped reading {url} at {MAX_PAGE_BYTES} bytes"
+                    )
+                    break
+            page_text = body.decode(
+                response.charset_encoding or 'utf-8', errors='replace'
+            )
 
         # Handle different content types
-        if 'application/pdf' in content_type:
-            logger.debug(f"Processing PDF content from {url}")
-            pdf_bytes = response.content
-            text_content = await asyncio.to_thread(parse_pdf_content, pdf_bytes)
-            return f"PDF Content (fallback):\n{text_content}"
-        elif 'text/html' in content_type:
+        if 'text/html' in content_type:
             logger.debug(f"Processing HTML content from {url}")
-            html_content = response.text
-            text_content = await asyncio.to_thread(parse_html_content, html_content)
+            text_content = await asyncio.to_thread(parse_html_content, page_text)
             return f"Extracted Content (BeautifulSoup fallback):\n{text_content}"
         else:
             logger.debug(f"Processing plain text content from {url}")
-            text_content = response.text[:20000]
+            text_content = page_text[:20000]
             return text_content
     except Exception as e:
         logger.error(f"Error fetching content from {url}: {e}", exc_info=True)